@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import EmployeeRegistration, CompanyCertificate, EmployerFeedback, JobPost, FavJob, Profile, EmployerRegistration, ViewedCandidate, ViewedJob, Notification
+from .models import EmployeeRegistration, CompanyCertificate, EmployerFeedback, JobPost, FavJob, Profile, EmployerRegistration, ViewedCandidate, ViewedJob, Notification, GeocodeCache, PushDelivery, JobFanout, NotificationArchive
 from import_export.admin import ImportExportModelAdmin
 
 @admin.register(EmployeeRegistration)
@@ -47,7 +47,7 @@ class EmployerFeedbackAdmin(ImportExportModelAdmin):
 
 @admin.register(JobPost)
 class JobPostAdmin(ImportExportModelAdmin):
-    list_display = ('job_title', 'employer', 'min_salary', 'max_salary', 'city', 'created_at', 'condition')
+    list_display = ('job_title', 'employer', 'min_salary', 'max_salary', 'city', 'created_at', 'condition', 'expires_at')
     search_fields = ('job_title', 'employer__company_name', 'city')
     list_filter = ('condition', 'created_at', 'city')
 
@@ -62,3 +62,28 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ('id', 'user_type', 'employee', 'employer', 'title', 'is_read', 'created_at')
     list_filter = ('user_type', 'is_read', 'created_at')
     search_fields = ('title', 'message', 'employee__name', 'employer__company_name')
+
+@admin.register(PushDelivery)
+class PushDeliveryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'notification', 'channel', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'channel')
+    search_fields = ('notification__title', 'last_error')
+    raw_id_fields = ('notification',)
+
+@admin.register(JobFanout)
+class JobFanoutAdmin(admin.ModelAdmin):
+    list_display = ('job', 'status', 'total_recipients', 'notified', 'pushes_sent', 'pushes_failed', 'pushes_queued', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    raw_id_fields = ('job',)
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'key', 'result', 'created_at', 'expires_at')
+    list_filter = ('kind',)
+    search_fields = ('key',)
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user_type', 'recipient_id', 'title', 'created_at', 'archived_at')
+    list_filter = ('user_type',)
+    search_fields = ('title',)
@@ -0,0 +1,87 @@
+"""
+Versioned response cache for the job feed.
+
+Cached job post list/detail payloads are keyed by the request URL plus a global
+"job feed version". Saving or deleting a JobPost or EmployerRegistration bumps
+the version (see apps.signals), which orphans every cached payload at once.
+Bulk ``.update()`` writers must call ``bump_job_feed_version()`` themselves.
+
+Uses the cache alias in settings.JOB_FEED_CACHE_ALIAS: local memory by default,
+a shared backend such as Redis when configured.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+VERSION_KEY = 'job_feed:version'
+HITS_KEY = 'job_feed:hits'
+MISSES_KEY = 'job_feed:misses'
+CACHED_HEADERS = ('Warning', 'X-Result-Truncated')
+
+
+def get_cache():
+    return caches[settings.JOB_FEED_CACHE_ALIAS]
+
+
+def get_job_feed_version():
+    return get_cache().get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def bump_job_feed_version():
+    cache = get_cache()
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key was evicted or never set; any fresh value invalidates old entries
+        cache.add(VERSION_KEY, 1, timeout=None)
+        return cache.incr(VERSION_KEY)
+
+
+def _count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def job_feed_cache_key(request):
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    raw = f'{request.get_host()}{request.path}?{params}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'job_feed:v2:{get_job_feed_version()}:{digest}'
+
+
+def cached_job_feed_response(request, build_response):
+    """Serve ``build_response()`` from the cache, storing successful responses."""
+    cache = get_cache()
+    key = job_feed_cache_key(request)
+    cached = cache.get(key)
+    if cached is not None:
+        _count(HITS_KEY)
+        return Response(cached['data'], headers={**cached['headers'], 'X-Cache': 'HIT'})
+    _count(MISSES_KEY)
+    response = build_response()
+    if response.status_code == 200:
+        # Keep the legacy-list pagination headers, see apps.pagination
+        headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+        cache.set(key, {'data': response.data, 'headers': headers}, settings.JOB_FEED_CACHE_TIMEOUT)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def job_feed_cache_stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+        'version': get_job_feed_version(),
+        'backend': settings.CACHES[settings.JOB_FEED_CACHE_ALIAS]['BACKEND'],
+    }
@@ -0,0 +1,210 @@
+"""
+Process-wide registry of third-party API clients.
+
+sns_client(), twilio_client() and fcm_client() build their client on first use
+and hand the same instance to every later caller and thread. Each client keeps
+its own HTTP connection pool, so repeated calls reuse connections instead of
+paying a TLS handshake each time. Importing this module needs no credentials.
+
+With settings.EXTERNAL_CLIENTS = 'fake' (or after use_fakes()) the registry hands
+out in-memory fakes that record every call and never touch the network, for
+tests, local development and benchmarks.
+"""
+import itertools
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def _sns():
+    import boto3
+    from botocore.config import Config
+
+    # Low-level boto3 clients are thread-safe; size the pool for the push worker's threads
+    config = Config(
+        max_pool_connections=settings.AWS_SNS_MAX_POOL_CONNECTIONS,
+        connect_timeout=5,
+        read_timeout=10,
+        retries={'max_attempts': 3, 'mode': 'standard'},
+    )
+    return boto3.session.Session().client(
+        'sns',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_SNS_REGION_NAME,
+        config=config,
+    )
+
+
+def _twilio():
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client
+
+    sid = getattr(settings, 'TWILIO_ACCOUNT_SID', None)
+    token = getattr(settings, 'TWILIO_AUTH_TOKEN', None)
+    if not sid or not token:
+        raise ImproperlyConfigured('TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set to send SMS.')
+    return Client(sid, token, http_client=TwilioHttpClient(pool_connections=True, timeout=10))
+
+
+class FirebaseMessaging:
+    """firebase_admin.messaging bound to this process' Firebase app."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def send(self, message):
+        from firebase_admin import messaging
+
+        return messaging.send(message, app=self.app)
+
+    def send_each(self, messages):
+        from firebase_admin import messaging
+
+        return messaging.send_each(messages, app=self.app)
+
+
+def _fcm():
+    import firebase_admin
+    from firebase_admin import credentials
+
+    try:
+        return FirebaseMessaging(firebase_admin.get_app())
+    except ValueError:
+        pass
+    try:
+        cred = credentials.Certificate(str(settings.FIREBASE_CREDENTIALS))
+    except (IOError, ValueError) as e:
+        raise ImproperlyConfigured(f'Cannot load Firebase credentials from {settings.FIREBASE_CREDENTIALS}: {e}')
+    return FirebaseMessaging(firebase_admin.initialize_app(cred))
+
+
+class FakeClient:
+    """Base for the in-memory fakes: records calls and can simulate latency."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _record(self, name, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((name, kwargs))
+            return next(self._ids)
+
+
+class FakeSNSClient(FakeClient):
+    def publish(self, **kwargs):
+        return {'MessageId': f'fake-sns-{self._record("publish", **kwargs)}'}
+
+    def create_platform_endpoint(self, PlatformApplicationArn, Token, **kwargs):
+        self._record('create_platform_endpoint', PlatformApplicationArn=PlatformApplicationArn, Token=Token)
+        return {'EndpointArn': f'{PlatformApplicationArn}/fake-{uuid.uuid5(uuid.NAMESPACE_OID, Token)}'}
+
+
+class FakeTwilioClient(FakeClient):
+    def __init__(self, latency=0.0):
+        super().__init__(latency)
+        self.messages = SimpleNamespace(create=self._create_message)
+
+    def _create_message(self, **kwargs):
+        return SimpleNamespace(sid=f'SMfake{self._record("messages.create", **kwargs)}', **kwargs)
+
+
+class FakeFirebaseMessaging(FakeClient):
+    """
+    Accepts every message except those for tokens in ``unregistered``, which
+    fail like a token from an uninstalled app.
+    """
+
+    def __init__(self, latency=0.0, unregistered=()):
+        super().__init__(latency)
+        self.unregistered = set(unregistered)
+
+    def _unregistered_error(self):
+        from firebase_admin import messaging
+
+        return messaging.UnregisteredError('Requested entity was not found.')
+
+    def send(self, message):
+        message_id = self._record('send', token=message.token)
+        if message.token in self.unregistered:
+            raise self._unregistered_error()
+        return f'projects/fake/messages/{message_id}'
+
+    def send_each(self, messages):
+        # One round trip for the whole batch, like the real API
+        self._record('send_each', tokens=[message.token for message in messages])
+        responses = []
+        for message in messages:
+            if message.token in self.unregistered:
+                responses.append(SimpleNamespace(success=False, message_id=None, exception=self._unregistered_error()))
+            else:
+                message_id = f'projects/fake/messages/{next(self._ids)}'
+                responses.append(SimpleNamespace(success=True, message_id=message_id, exception=None))
+        failures = sum(1 for response in responses if not response.success)
+        return SimpleNamespace(responses=responses, success_count=len(responses) - failures, failure_count=failures)
+
+
+LIVE_FACTORIES = {'sns': _sns, 'twilio': _twilio, 'fcm': _fcm}
+FAKE_FACTORIES = {'sns': FakeSNSClient, 'twilio': FakeTwilioClient, 'fcm': FakeFirebaseMessaging}
+
+
+def get_client(name):
+    """Return this process' client for ``name`` ('sns', 'twilio' or 'fcm'), creating it on first use."""
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                if settings.EXTERNAL_CLIENTS == 'fake':
+                    client = FAKE_FACTORIES[name](latency=settings.FAKE_CLIENT_LATENCY)
+                else:
+                    client = LIVE_FACTORIES[name]()
+                _clients[name] = client
+    return client
+
+
+def sns_client():
+    return get_client('sns')
+
+
+def twilio_client():
+    return get_client('twilio')
+
+
+def fcm_client():
+    return get_client('fcm')
+
+
+def set_client(name, client):
+    """Install ``client`` for ``name``, e.g. a configured fake in a test."""
+    with _lock:
+        _clients[name] = client
+    return client
+
+
+def use_fakes(latency=0.0, **options):
+    """Swap every provider for a fresh in-memory fake and return them by name."""
+    fakes = {name: factory(latency=latency) for name, factory in FAKE_FACTORIES.items()}
+    if 'unregistered' in options:
+        fakes['fcm'].unregistered = set(options['unregistered'])
+    with _lock:
+        _clients.update(fakes)
+    return fakes
+
+
+def reset_clients():
+    """Forget every client so the next call builds a new one."""
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,61 @@
+"""
+Conditional GET (ETag / Last-Modified) for read endpoints.
+
+Validators are derived from cheap aggregates over the filtered queryset
+(row count plus max(updated_at) and friends) rather than from the rendered body,
+so a matching If-None-Match / If-Modified-Since returns 304 without
+serializing anything.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def queryset_validators(queryset, modified_fields=(), **extra):
+    """
+    Return ``(etag, last_modified)`` for a queryset.
+
+    ``modified_fields`` are datetime fields (joins allowed) whose maximum is the
+    Last-Modified value; ``extra`` aggregates are folded into the ETag only, for
+    changes no timestamp records (e.g. a notification being marked read).
+    """
+    aggregates = {f'modified_{i}': Max(field) for i, field in enumerate(modified_fields)}
+    values = queryset.order_by().aggregate(count=Count('pk'), **aggregates, **extra)
+    timestamps = [values[name] for name in aggregates if values[name] is not None]
+    last_modified = max(timestamps) if timestamps else None
+    raw = ':'.join(f'{name}={values[name]}' for name in sorted(values))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest()), last_modified
+
+
+def object_validators(view, modified_fields=(), **extra):
+    """
+    queryset_validators() for the object a detail view is about to fetch. A
+    lookup value the field cannot hold (e.g. /job-posts/abc/) is a 404, as it
+    would be from get_object(), instead of an error inside the ORM.
+    """
+    queryset = view.get_queryset()
+    opts = queryset.model._meta
+    field = opts.pk if view.lookup_field == 'pk' else opts.get_field(view.lookup_field)
+    try:
+        value = field.to_python(view.kwargs[view.lookup_url_kwarg or view.lookup_field])
+    except ValidationError:
+        raise Http404
+    return queryset_validators(queryset.filter(**{view.lookup_field: value}), modified_fields, **extra)
+
+
+def conditional_response(request, validators, build_response):
+    """Answer 304/412 from ``validators`` if the request's preconditions allow, else ``build_response()``."""
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build_response()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
@@ -0,0 +1,225 @@
+"""
+Vectorized distance engine for nearby search.
+
+Keeps a compact NumPy snapshot of ``(id, lat, lon)`` for every employee and
+employer with coordinates, so a radius query is one bounding-box mask plus one
+vectorized haversine pass instead of a per-row Python loop. Snapshots load
+lazily, are patched in place from post_save/post_delete (see apps.signals) and
+fully reloaded after settings.DISTANCE_SNAPSHOT_TTL seconds so that writes made
+by other worker processes show up too.
+
+k-nearest queries go through a KD-tree over 3D unit vectors (chord length is
+monotonic in great-circle distance, so the neighbours are exact). Points changed
+since the tree was built are kept in a small dirty set that is searched by brute
+force and masked out of tree results; the tree is rebuilt once that set grows.
+"""
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from scipy.spatial import cKDTree
+
+from .geo import EARTH_RADIUS_KM, bounding_box
+from .models import EmployeeRegistration, EmployerRegistration
+
+
+def haversine_km(lat, lon, lat_rad, lon_rad):
+    """Distances in km from (lat, lon) in degrees to arrays of points given in radians."""
+    lat0, lon0 = np.radians(lat), np.radians(lon)
+    a = np.sin((lat_rad - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat_rad) * np.sin((lon_rad - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def to_unit_vectors(lat_rad, lon_rad):
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+
+
+def chord_length(distance_km):
+    return 2 * np.sin(distance_km / (2 * EARTH_RADIUS_KM))
+
+
+def arc_length(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1))
+
+
+class CoordinateSnapshot:
+    """In-memory ``(id, lat, lon)`` arrays for one model, with amortized O(1) upserts."""
+
+    # Rebuild the KD-tree once this many points (or this share of all points) changed since the last build
+    REBUILD_MIN_CHANGES = 1024
+    REBUILD_FRACTION = 0.05
+
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._reset(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+
+    def _reset(self, ids, lat_deg, lon_deg):
+        self.size = len(ids)
+        self.ids = ids
+        self.lat_deg = lat_deg
+        self.lon_deg = lon_deg
+        self.lat_rad = np.radians(lat_deg)
+        self.lon_rad = np.radians(lon_deg)
+        self.positions = {int(pk): i for i, pk in enumerate(ids)}
+        self._build_tree()
+
+    def _build_tree(self):
+        n = self.size
+        self.tree_ids = self.ids[:n].copy()
+        self.tree = cKDTree(to_unit_vectors(self.lat_rad[:n], self.lon_rad[:n])) if n else None
+        self.dirty = set()
+
+    def _changed(self, pk):
+        self.dirty.add(pk)
+        if len(self.dirty) > max(self.REBUILD_MIN_CHANGES, self.REBUILD_FRACTION * self.size):
+            self._build_tree()
+
+    @classmethod
+    def from_arrays(cls, ids, lat_deg, lon_deg, model=None):
+        """Build a detached snapshot, e.g. for benchmarks."""
+        snapshot = cls(model)
+        snapshot._reset(np.asarray(ids, dtype=np.int64), np.asarray(lat_deg, dtype=float), np.asarray(lon_deg, dtype=float))
+        snapshot._loaded_at = float('inf')
+        return snapshot
+
+    def load(self):
+        rows = self.model.objects.filter(latitude__isnull=False, longitude__isnull=False).values_list('pk', 'latitude', 'longitude')
+        data = np.array(list(rows), dtype=float).reshape(-1, 3)
+        with self._lock:
+            self._reset(data[:, 0].astype(np.int64), data[:, 1].copy(), data[:, 2].copy())
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > settings.DISTANCE_SNAPSHOT_TTL:
+            self.load()
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    def upsert(self, pk, lat, lon):
+        """Add or move one point; a missing coordinate removes it."""
+        if lat is None or lon is None:
+            return self.remove(pk)
+        lat, lon = float(lat), float(lon)
+        with self._lock:
+            i = self.positions.get(pk)
+            if i is None:
+                if self.size == len(self.ids):
+                    self._grow()
+                i = self.size
+                self.size += 1
+                self.ids[i] = pk
+                self.positions[pk] = i
+            self.lat_deg[i], self.lon_deg[i] = lat, lon
+            self.lat_rad[i], self.lon_rad[i] = np.radians(lat), np.radians(lon)
+            self._changed(pk)
+
+    def remove(self, pk):
+        with self._lock:
+            i = self.positions.pop(pk, None)
+            if i is None:
+                return
+            last = self.size - 1
+            if i != last:
+                # Move the last point into the hole so the live rows stay contiguous
+                for array in (self.ids, self.lat_deg, self.lon_deg, self.lat_rad, self.lon_rad):
+                    array[i] = array[last]
+                self.positions[int(self.ids[i])] = i
+            self.size = last
+            self._changed(pk)
+
+    def _grow(self):
+        capacity = max(16, 2 * len(self.ids))
+        for name in ('ids', 'lat_deg', 'lon_deg', 'lat_rad', 'lon_rad'):
+            array = getattr(self, name)
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            setattr(self, name, grown)
+
+    def within(self, lat, lon, radius_km):
+        """Return ``(ids, distances_km)`` of points within the radius, closest first."""
+        if self.model is not None:
+            self._ensure_loaded()
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        with self._lock:
+            n = self.size
+            lat_deg = self.lat_deg[:n]
+            mask = (lat_deg >= min_lat) & (lat_deg <= max_lat)
+            if min_lon is not None:
+                lon_deg = self.lon_deg[:n]
+                mask &= (lon_deg >= min_lon) & (lon_deg <= max_lon)
+            ids = self.ids[:n][mask]
+            distances = haversine_km(lat, lon, self.lat_rad[:n][mask], self.lon_rad[:n][mask])
+        keep = distances <= radius_km
+        ids, distances = ids[keep], distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return ids[order], distances[order]
+
+    def nearest_k(self, lat, lon, k, radius_km=None, offset=0):
+        """
+        Return ``(ids, distances_km)`` of the neighbours ranked offset..offset+k
+        around (lat, lon), closest first, optionally cut off at ``radius_km``.
+        """
+        if self.model is not None:
+            self._ensure_loaded()
+        wanted = offset + k
+        point = to_unit_vectors(np.radians([lat]), np.radians([lon]))[0]
+        # Small slack so points exactly on the radius survive the chord round trip
+        bound = chord_length(radius_km) * (1 + 1e-9) if radius_km is not None else np.inf
+        ids_parts, distance_parts = [], []
+        with self._lock:
+            if self.tree is not None:
+                # Ask for extra neighbours to make up for tree points that are stale
+                count = min(wanted + len(self.dirty), len(self.tree_ids))
+                chords, indexes = self.tree.query(point, k=count, distance_upper_bound=bound)
+                chords, indexes = np.atleast_1d(chords), np.atleast_1d(indexes)
+                found = np.isfinite(chords)
+                chords, indexes = chords[found], indexes[found]
+                if found.all() and count < len(self.tree_ids):
+                    # The tree cuts ties at the k-th distance arbitrarily; take every point up to it
+                    # so the id tiebreak (and with it cursor paging) stays stable
+                    indexes = np.array(self.tree.query_ball_point(point, chords[-1] * (1 + 1e-12)), dtype=np.int64)
+                    chords = np.linalg.norm(self.tree.data[indexes] - point, axis=1)
+                tree_ids = self.tree_ids[indexes]
+                fresh = ~np.isin(tree_ids, list(self.dirty)) if self.dirty else slice(None)
+                ids_parts.append(tree_ids[fresh])
+                distance_parts.append(arc_length(chords[fresh]))
+            positions = np.array([self.positions[pk] for pk in self.dirty if pk in self.positions], dtype=np.int64)
+            if len(positions):
+                ids_parts.append(self.ids[positions])
+                distance_parts.append(haversine_km(lat, lon, self.lat_rad[positions], self.lon_rad[positions]))
+        if not ids_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids, distances = np.concatenate(ids_parts), np.concatenate(distance_parts)
+        if radius_km is not None:
+            keep = distances <= radius_km
+            ids, distances = ids[keep], distances[keep]
+        order = np.lexsort((ids, distances))[offset:wanted]
+        return ids[order], distances[order]
+
+
+employee_coordinates = CoordinateSnapshot(EmployeeRegistration)
+employer_coordinates = CoordinateSnapshot(EmployerRegistration)
+SNAPSHOTS = {
+    EmployeeRegistration: employee_coordinates,
+    EmployerRegistration: employer_coordinates,
+}
+
+
+def nearest(snapshot, lat, lon, radius_km=None, k=None, offset=0):
+    """
+    Return ``[(distance_km, obj), ...]`` closest first, fetching only the matches:
+    everything within ``radius_km``, or with ``k`` the k nearest from ``offset``
+    (``radius_km`` then being an optional cut-off).
+    """
+    if k is None:
+        ids, distances = snapshot.within(lat, lon, radius_km)
+    else:
+        ids, distances = snapshot.nearest_k(lat, lon, k, radius_km, offset)
+    objects = snapshot.model.objects.in_bulk(ids.tolist())
+    return [(float(dist), objects[pk]) for pk, dist in zip(ids.tolist(), distances) if pk in objects]
@@ -0,0 +1,36 @@
+"""
+Job post expiry engine.
+
+Every job post carries an ``expires_at`` timestamp derived from the employer's
+plan (see ``EmployerRegistration.PLAN_VALIDITY_DAYS``). Reads only filter on it;
+flipping expired posts back to draft is done here in one set-based UPDATE,
+driven by the ``expire_job_posts`` management command.
+"""
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import bump_job_feed_version
+from .models import JobPost
+
+
+def expire_job_posts(now=None):
+    """Move every posted job whose expiry has passed back to draft. Returns the number of rows changed."""
+    now = now or timezone.now()
+    count = JobPost.objects.expired(now).update(condition='draft', updated_at=now)
+    if count:
+        bump_job_feed_version()
+    return count
+
+
+def reschedule_job_posts(employer):
+    """Recompute ``expires_at`` for all of an employer's posts after a plan change."""
+    posts = JobPost.objects.filter(employer=employer)
+    days = employer.PLAN_VALIDITY_DAYS.get(employer.subscription_type)
+    if days is None:
+        count = posts.update(expires_at=None)
+    else:
+        count = posts.update(expires_at=F('created_at') + timedelta(days=days))
+    bump_job_feed_version()
+    return count
@@ -0,0 +1,133 @@
+"""
+Bulk "New Job Match" fan-out.
+
+Creating a job post only records a pending JobFanout. run_push_worker claims
+it and streams the matching employees in chunks. Each chunk gets its
+Notifications and PushDeliveries bulk-created in one transaction, and its FCM
+pushes sent straight away in one send_each call. SNS pushes, and FCM pushes
+that need a retry, are left to the outbox. Progress counters and a keyset
+checkpoint are saved with every chunk. The updated_at column doubles as a
+heartbeat: a fan-out whose worker went quiet for longer than the lease is
+picked up again and resumes after its checkpoint. A fan-out that raises goes
+back to pending with the outbox's exponential backoff and also resumes after
+its checkpoint; it is only marked failed after MAX_ATTEMPTS claims.
+"""
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import EmployeeRegistration, JobFanout, Notification, PushDelivery
+from .outbox import deliver, push_target, retry_delay
+from .streaming import publish_notifications
+
+TITLE = 'New Job Match'
+MAX_ATTEMPTS = 5
+
+
+def job_match_message(job):
+    return f'New job posted: {job.job_title} matches your profile!'
+
+
+def job_match_recipients(job):
+    # Example: notify employees with matching work_category
+    return EmployeeRegistration.objects.filter(work_category=job.experience)
+
+
+def claim_fanout(lease_seconds=300, now=None):
+    """Lock and return the oldest fan-out that is due or whose worker went quiet, or None."""
+    now = now or timezone.now()
+    due = Q(status='pending', next_attempt_at__lte=now)
+    stale = Q(status='running', updated_at__lt=now - timedelta(seconds=lease_seconds))
+    with transaction.atomic():
+        fanout = (
+            JobFanout.objects.select_for_update(skip_locked=True)
+            .filter(due | stale)
+            .select_related('job')
+            .order_by('created_at')
+            .first()
+        )
+        if fanout is None:
+            return None
+        fanout.status = 'running'
+        fanout.attempts += 1
+        fanout.started_at = fanout.started_at or now
+        fanout.save(update_fields=['status', 'attempts', 'started_at', 'updated_at'])
+    return fanout
+
+
+def run_fanout(
+    fanout, executor, chunk_size=500, max_attempts=5, lease_seconds=60, on_chunk=None,
+    fanout_attempts=MAX_ATTEMPTS, **senders
+):
+    """
+    Notify every remaining recipient of the fan-out's job, chunk by chunk.
+    ``max_attempts`` applies to each push delivery, ``fanout_attempts`` to the
+    fan-out itself.
+    """
+    job = fanout.job
+    message = job_match_message(job)
+    recipients = (
+        job_match_recipients(job)
+        .filter(employee_id__gt=fanout.last_employee_id)
+        .order_by('employee_id')
+        .only('employee_id', 'fcm_token', 'device_token')
+    )
+    if fanout.total_recipients is None:
+        fanout.total_recipients = recipients.count()
+        fanout.save(update_fields=['total_recipients', 'updated_at'])
+    rows = recipients.iterator(chunk_size=chunk_size)
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            now = timezone.now()
+            with transaction.atomic():
+                notifications = Notification.objects.bulk_create([
+                    Notification(employee=employee, user_type='employee', title=TITLE, message=message)
+                    for employee in chunk
+                ])
+                deliveries = []
+                for employee, notification in zip(chunk, notifications):
+                    target = push_target(employee)
+                    if target['channel'] == 'fcm':
+                        # Claimed by this worker under a lease, so the outbox leaves it alone unless we die
+                        deliveries.append(PushDelivery(
+                            notification=notification, status='sending', attempts=1,
+                            next_attempt_at=now + timedelta(seconds=lease_seconds), **target,
+                        ))
+                    else:
+                        deliveries.append(PushDelivery(notification=notification, **target))
+                PushDelivery.objects.bulk_create(deliveries)
+                publish_notifications(notifications)
+                JobFanout.objects.filter(pk=fanout.pk).update(
+                    notified=F('notified') + len(chunk),
+                    pushes_queued=F('pushes_queued') + sum(1 for d in deliveries if d.channel != 'fcm'),
+                    last_employee_id=chunk[-1].pk,
+                    updated_at=now,
+                )
+            fcm = [d for d in deliveries if d.channel == 'fcm']
+            counts = deliver(fcm, executor, max_attempts, **senders) if fcm else {'sent': 0, 'retrying': 0, 'failed': 0}
+            JobFanout.objects.filter(pk=fanout.pk).update(
+                pushes_sent=F('pushes_sent') + counts['sent'],
+                pushes_failed=F('pushes_failed') + counts['failed'],
+                pushes_queued=F('pushes_queued') + counts['retrying'],
+                updated_at=timezone.now(),
+            )
+            if on_chunk:
+                on_chunk(len(chunk), counts)
+    except Exception as e:
+        now = timezone.now()
+        if fanout.attempts >= fanout_attempts:
+            retry = {'status': 'failed'}
+        else:
+            # Chunks committed so far stay sent; the retry starts after last_employee_id
+            retry = {'status': 'pending', 'next_attempt_at': now + retry_delay(fanout.attempts)}
+        JobFanout.objects.filter(pk=fanout.pk).update(**retry, last_error=f'{type(e).__name__}: {e}', updated_at=now)
+        raise
+    JobFanout.objects.filter(pk=fanout.pk).update(status='done', finished_at=timezone.now(), updated_at=timezone.now())
+    fanout.refresh_from_db()
+    return fanout
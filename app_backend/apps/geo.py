@@ -0,0 +1,81 @@
+"""
+Geo helpers for the nearby-search endpoints.
+
+Radius queries first narrow candidates with a bounding box over the indexed
+(latitude, longitude) columns and only then run the exact haversine check,
+either in Python or in SQL via distance_km().
+"""
+from math import asin, cos, degrees, radians, sin, sqrt
+
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371
+
+
+def haversine(lon1, lat1, lon2, lat2):
+    """Calculate the great circle distance in kilometers between two points on the earth."""
+    # convert decimal degrees to radians
+    lon1, lat1, lon2, lat2 = map(float, [lon1, lat1, lon2, lat2])
+    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
+    # haversine formula
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+    return c * EARTH_RADIUS_KM
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Return (min_lat, max_lat, min_lon, max_lon) enclosing the circle of
+    ``radius_km`` around (lat, lon). The longitude bounds are None when the box
+    would reach a pole or wrap the antimeridian.
+    """
+    dlat = degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), None, None
+    dlon = degrees(asin(min(1, sin(radius_km / EARTH_RADIUS_KM) / cos(radians(lat)))))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def within_bounding_box(queryset, lat, lon, radius_km, prefix=''):
+    """Filter rows whose ``{prefix}latitude``/``{prefix}longitude`` fall inside the radius' bounding box."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    lookups = {f'{prefix}latitude__range': (min_lat, max_lat)}
+    if min_lon is None:
+        lookups[f'{prefix}longitude__isnull'] = False
+    else:
+        lookups[f'{prefix}longitude__range'] = (min_lon, max_lon)
+    return queryset.filter(**lookups)
+
+
+def in_bounding_box(box, lat, lon):
+    """Whether (lat, lon) lies in ``box`` from bounding_box(); None longitude bounds admit any longitude."""
+    min_lat, max_lat, min_lon, max_lon = box
+    if not min_lat <= lat <= max_lat:
+        return False
+    return min_lon is None or min_lon <= lon <= max_lon
+
+
+def distance_km(lat, lon, prefix=''):
+    """
+    Database expression for the haversine distance in km between (lat, lon) and
+    the row's ``{prefix}latitude``/``{prefix}longitude``, so rows can be ranked in SQL.
+    """
+    lat_rad, lon_rad = radians(lat), radians(lon)
+    row_lat = Radians(F(f'{prefix}latitude'))
+    row_lon = Radians(F(f'{prefix}longitude'))
+    a = (
+        Power(Sin((row_lat - Value(lat_rad)) / 2), 2)
+        + Value(cos(lat_rad)) * Cos(row_lat) * Power(Sin((row_lon - Value(lon_rad)) / 2), 2)
+    )
+    # Rounding can push a hair above 1 for antipodal points, which ASIN rejects
+    return ExpressionWrapper(
+        2 * EARTH_RADIUS_KM * ASin(Sqrt(Least(a, Value(1.0)))),
+        output_field=FloatField(),
+    )
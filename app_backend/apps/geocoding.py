@@ -0,0 +1,276 @@
+"""
+Pluggable geocoding with a two-level cache for network backends.
+
+forward_geocode() and reverse_geocode() ask each backend in
+settings.GEOCODER_BACKENDS in turn until one answers. The bundled
+GazetteerGeocoder answers district and taluk lookups from memory. The
+MapboxGeocoder calls the Mapbox API and is only needed as a fallback.
+
+Network lookups sit behind a two-level cache: an in-process LRU first, then
+the geocode_cache table shared by every worker, and only then the API. Forward lookups are keyed by
+the normalized address. Reverse lookups are keyed by lat/lon rounded to
+settings.GEOCODE_REVERSE_PRECISION, so nearby coordinates share an entry. Both
+levels expire after settings.GEOCODE_CACHE_TTL seconds. "No match" answers are
+cached too; failed requests are not.
+"""
+import csv
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .distance import haversine_km
+from .models import GeocodeCache
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU of ``key -> (value, expires_at_timestamp)``."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_lru = LRUCache(settings.GEOCODE_CACHE_LRU_SIZE)
+_stats = {'lru_hits': 0, 'db_hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def normalize_address(address):
+    """Lowercase, trim and collapse whitespace so "Salem,Tamil  Nadu" and "salem, tamil nadu" share an entry."""
+    address = re.sub(r'\s+', ' ', str(address).strip().lower())
+    return re.sub(r'\s*,\s*', ', ', address)
+
+
+def reverse_key(lat, lon):
+    """Return ``(key, lat, lon)`` with the coordinates rounded to the cache precision."""
+    precision = settings.GEOCODE_REVERSE_PRECISION
+    lat, lon = round(float(lat), precision), round(float(lon), precision)
+    return f'{lat:.{precision}f},{lon:.{precision}f}', lat, lon
+
+
+def _db_key(key):
+    # Very long addresses are stored by digest to fit the column
+    max_length = GeocodeCache._meta.get_field('key').max_length
+    return key if len(key) <= max_length else hashlib.sha256(key.encode()).hexdigest()
+
+
+def cached_geocode(kind, key, fetch):
+    """
+    Return the cached result for ``(kind, key)``, calling ``fetch()`` on a miss.
+    ``fetch()`` returns None when nothing matched (cached) and raises on
+    failure (not cached).
+    """
+    value = _lru.get((kind, key))
+    if value is not _MISSING:
+        _count('lru_hits')
+        return value
+    now = timezone.now()
+    entry = (
+        GeocodeCache.objects.filter(kind=kind, key=_db_key(key), expires_at__gt=now)
+        .values_list('result', 'expires_at')
+        .first()
+    )
+    if entry is not None:
+        _count('db_hits')
+        result, expires_at = entry
+        _lru.set((kind, key), result, expires_at.timestamp())
+        return result
+    _count('misses')
+    result = fetch()
+    expires_at = now + timedelta(seconds=settings.GEOCODE_CACHE_TTL)
+    # Upsert in one statement; an expired row for the same key is overwritten
+    GeocodeCache.objects.bulk_create(
+        [GeocodeCache(kind=kind, key=_db_key(key), result=result, expires_at=expires_at)],
+        update_conflicts=True,
+        unique_fields=['kind', 'key'],
+        update_fields=['result', 'expires_at'],
+    )
+    _lru.set((kind, key), result, expires_at.timestamp())
+    return result
+
+
+def geocode_cache_stats():
+    """Hit/miss counters of this worker process, plus the size of both levels."""
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats['lru_hits'] + stats['db_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['lru_hits'] + stats['db_hits']) / total, 4) if total else None
+    stats['lru_size'] = len(_lru)
+    stats['db_entries'] = GeocodeCache.objects.filter(expires_at__gt=timezone.now()).count()
+    return stats
+
+
+Place = namedtuple('Place', 'name kind district state latitude longitude')
+
+
+class GazetteerGeocoder:
+    """
+    Offline geocoder over the bundled district/taluk centroids in
+    settings.GAZETTEER_PATH (CSV: name, kind, district, state, latitude,
+    longitude, aliases separated by "|"). The file is loaded once per process.
+    """
+    cacheable = False
+
+    def __init__(self, path=None):
+        self.path = path or settings.GAZETTEER_PATH
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            places, index = [], {}
+            with open(self.path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    place = Place(
+                        row['name'], row['kind'], row['district'], row['state'],
+                        float(row['latitude']), float(row['longitude']),
+                    )
+                    places.append(place)
+                    for name in [row['name'], *filter(None, row['aliases'].split('|'))]:
+                        index.setdefault(normalize_address(name), []).append(place)
+            self.places = places
+            self.index = index
+            self.lat_rad = np.radians([place.latitude for place in places])
+            self.lon_rad = np.radians([place.longitude for place in places])
+            self._loaded = True
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._load()
+
+    def match(self, address):
+        """Return the most specific Place named in the address, or None."""
+        self._ensure_loaded()
+        # "12 Main Road, Attur, Salem 636102, Tamil Nadu" -> ['main road', 'attur', 'salem', 'tamil nadu']
+        parts = [re.sub(r'[\d-]+', ' ', part).strip() for part in normalize_address(address).split(',')]
+        parts = [re.sub(r'\s+', ' ', part) for part in parts if part]
+        # Free text without commas ("gandhipuram coimbatore"): fall back to two- and one-word phrases
+        words = ' '.join(parts).split()
+        phrases = parts + [' '.join(words[i:i + n]) for n in (2, 1) for i in range(len(words) - n + 1)]
+        districts = {
+            place.name for phrase in phrases for place in self.index.get(phrase, ()) if place.kind == 'district'
+        }
+        for phrase in phrases:
+            candidates = self.index.get(phrase)
+            if candidates:
+                return self._pick(candidates, districts)
+        return None
+
+    @staticmethod
+    def _pick(candidates, districts):
+        # "Tenkasi, Tirunelveli" is the taluk; plain "Tenkasi" is the district
+        for place in candidates:
+            if place.kind == 'taluk' and place.district in districts:
+                return place
+        return next((place for place in candidates if place.kind == 'district'), candidates[0])
+
+    def forward(self, address):
+        place = self.match(address)
+        return [place.longitude, place.latitude] if place else None
+
+    def nearest(self, lat, lon):
+        """Return ``(place, distance_km)`` for the closest centroid."""
+        self._ensure_loaded()
+        distances = haversine_km(float(lat), float(lon), self.lat_rad, self.lon_rad)
+        i = int(np.argmin(distances))
+        return self.places[i], float(distances[i])
+
+    def reverse(self, lat, lon):
+        place, distance = self.nearest(lat, lon)
+        if distance > settings.GAZETTEER_MAX_DISTANCE_KM:
+            return None
+        if place.kind == 'district':
+            return f"{place.name}, {place.state}, India"
+        return f"{place.name}, {place.district}, {place.state}, India"
+
+
+class MapboxGeocoder:
+    """Mapbox Geocoding API; skipped when settings.MAPBOX_API_KEY is unset."""
+    cacheable = True
+
+    def forward(self, address):
+        if not settings.MAPBOX_API_KEY:
+            return None
+        from .utils import mapbox_geocode_address
+        return mapbox_geocode_address(address, settings.MAPBOX_API_KEY)
+
+    def reverse(self, lat, lon):
+        if not settings.MAPBOX_API_KEY:
+            return None
+        from .utils import mapbox_reverse_geocode
+        return mapbox_reverse_geocode(lat, lon, settings.MAPBOX_API_KEY)
+
+
+_backends = None
+_backends_lock = threading.Lock()
+
+
+def get_geocoders():
+    global _backends
+    if _backends is None:
+        with _backends_lock:
+            if _backends is None:
+                _backends = [import_string(path)() for path in settings.GEOCODER_BACKENDS]
+    return _backends
+
+
+def forward_geocode(address):
+    """Return [longitude, latitude] from the first backend that knows the address, or None."""
+    for backend in get_geocoders():
+        coords = backend.forward(address)
+        if coords:
+            return coords
+    return None
+
+
+def reverse_geocode(lat, lon):
+    """Return a place name for (lat, lon) from the first backend that has one, or None."""
+    for backend in get_geocoders():
+        address = backend.reverse(lat, lon)
+        if address:
+            return address
+    return None
@@ -0,0 +1,152 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from apps.models import EmployeeRegistration, EmployerRegistration
+
+# model option -> (model, fields joined into the address, most specific first)
+TARGETS = {
+    'employee': (EmployeeRegistration, ('address', 'city', 'district')),
+    'employer': (EmployerRegistration, ('address', 'location', 'taluk', 'district')),
+}
+
+
+class RateLimiter:
+    """Token bucket shared by the worker threads; a rate of 0 disables it."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Command(BaseCommand):
+    help = (
+        'Geocode employee/employer registrations that have no latitude/longitude, '
+        'concurrently and rate limited, writing results back in bulk_update batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=['employee', 'employer', 'all'], default='all')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent geocoding threads')
+        parser.add_argument('--rate', type=float, default=10, help='Max geocoding calls per second (0 = unlimited)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows fetched and written per batch')
+        parser.add_argument(
+            '--after-id', type=int, help='Resume after this primary key (printed with every batch); needs --model employee or employer'
+        )
+        parser.add_argument('--limit', type=int, help='Stop after this many rows per model')
+        parser.add_argument(
+            '--geocoder',
+            default='apps.geocoding.forward_geocode',
+            help='Dotted path to a function or geocoder class with forward(address) -> [longitude, latitude] or None',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows are missing coordinates')
+
+    def handle(self, *args, **options):
+        try:
+            geocoder = import_string(options['geocoder'])
+        except ImportError as e:
+            raise CommandError(f"Cannot import geocoder {options['geocoder']}: {e}")
+        if isinstance(geocoder, type):
+            geocoder = geocoder().forward
+        # Employee and employer ids are unrelated sequences, so one resume point cannot cover both
+        if options['after_id'] is not None and options['model'] == 'all':
+            raise CommandError('--after-id applies to a single model; pass --model employee or --model employer.')
+        models = list(TARGETS) if options['model'] == 'all' else [options['model']]
+        limiter = RateLimiter(options['rate'], burst=options['workers'])
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for name in models:
+                self.backfill(name, geocoder, limiter, executor, options)
+
+    def backfill(self, name, geocoder, limiter, executor, options):
+        model, address_fields = TARGETS[name]
+        pk_name = model._meta.pk.name
+        after_id = options['after_id'] or 0
+        missing = model.objects.filter(latitude__isnull=True).filter(**{f'{pk_name}__gt': after_id})
+        total = missing.count()
+        if options['limit']:
+            total = min(total, options['limit'])
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{name}: {total} rows missing coordinates.'))
+            return
+        self.stdout.write(f'{name}: geocoding {total} rows missing coordinates...')
+
+        errors = []
+
+        def locate(address):
+            limiter.acquire()
+            try:
+                return geocoder(address)
+            except Exception as e:
+                errors.append(f'{address!r}: {e}')
+                return None
+
+        processed = located = calls = 0
+        last_id = after_id
+        started = time.monotonic()
+        while processed < total:
+            # Keyset pagination keeps every batch an index range scan, however far in we are
+            size = min(options['batch_size'], total - processed)
+            rows = list(
+                missing.filter(**{f'{pk_name}__gt': last_id})
+                .order_by(pk_name)
+                .only(pk_name, 'latitude', 'longitude', *address_fields)[:size]
+            )
+            if not rows:
+                break
+            addresses = {}
+            for row in rows:
+                parts = [getattr(row, field) for field in address_fields]
+                addresses[row.pk] = ', '.join(part.strip() for part in parts if part and part.strip())
+            # Registrations share a handful of district/taluk names, so geocode each distinct address once
+            unique = sorted({address for address in addresses.values() if address})
+            results = dict(zip(unique, executor.map(locate, unique)))
+            calls += len(unique)
+
+            now = timezone.now()
+            updated = []
+            for row in rows:
+                coords = results.get(addresses[row.pk])
+                if coords:
+                    row.longitude, row.latitude = coords[0], coords[1]
+                    row.updated_at = now
+                    updated.append(row)
+            # bulk_update skips post_save, so nearby search picks these up on its next snapshot reload
+            model.objects.bulk_update(updated, ['latitude', 'longitude', 'updated_at'])
+
+            processed += len(rows)
+            located += len(updated)
+            last_id = rows[-1].pk
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{name}: {processed}/{total} rows, {located} located, {processed - located} unresolved, '
+                f'{calls} geocoder calls, {processed / elapsed:.1f} rows/s (resume with --model {name} --after-id {last_id})'
+            )
+
+        for error in errors[:20]:
+            self.stdout.write(self.style.ERROR(f'Geocoding failed for {error}'))
+        if len(errors) > 20:
+            self.stdout.write(self.style.ERROR(f'... and {len(errors) - 20} more failures'))
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: located {located} of {processed} rows in {elapsed:.1f}s '
+            f'({processed / elapsed if elapsed else 0:.1f} rows/s, {calls} geocoder calls).'
+        ))
@@ -0,0 +1,62 @@
+import time
+from django.core.management.base import BaseCommand
+import numpy as np
+from apps.distance import CoordinateSnapshot
+from apps.geo import bounding_box, haversine, in_bounding_box
+
+class Command(BaseCommand):
+    help = 'Compare the NumPy distance engine (radius and k-nearest) against the scalar haversine() loop on synthetic points.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,100000,1000000', help='Comma-separated point counts')
+        parser.add_argument('--radius', type=float, default=10.0, help='Query radius in km')
+        parser.add_argument('--k', type=int, default=50, help='Neighbours for the k-nearest (KD-tree) query')
+        parser.add_argument('--queries', type=int, default=3, help='Queries per size (timings are averaged)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        radius, k = options['radius'], options['k']
+        self.stdout.write(
+            f"{'points':>10} {'scalar loop':>14} {'bbox + loop':>14} {'numpy engine':>14} {'speedup':>9} {'matches':>8} "
+            f"{'k-nearest':>14}"
+        )
+        for size in [int(value) for value in options['sizes'].split(',')]:
+            # Roughly the extent of India
+            lats = rng.uniform(8.0, 37.0, size)
+            lons = rng.uniform(68.0, 97.0, size)
+            snapshot = CoordinateSnapshot.from_arrays(np.arange(size), lats, lons)
+            points = list(zip(range(size), lats.tolist(), lons.tolist()))
+            centres = [(rng.uniform(10.0, 35.0), rng.uniform(70.0, 95.0)) for _ in range(options['queries'])]
+
+            scalar = self.time_queries(centres, lambda lat, lon: self.scalar_loop(points, lat, lon, radius))
+            boxed = self.time_queries(centres, lambda lat, lon: self.boxed_loop(points, lat, lon, radius))
+            engine = self.time_queries(centres, lambda lat, lon: snapshot.within(lat, lon, radius)[0].tolist())
+            nearest = self.time_queries(centres, lambda lat, lon: snapshot.nearest_k(lat, lon, k)[0].tolist())
+            matches = len(snapshot.within(*centres[0], radius)[0])
+            self.stdout.write(
+                f'{size:>10} {scalar * 1000:>12.2f}ms {boxed * 1000:>12.2f}ms {engine * 1000:>12.2f}ms '
+                f'{scalar / engine:>8.1f}x {matches:>8} {nearest * 1000:>12.2f}ms'
+            )
+
+    def time_queries(self, centres, query):
+        start = time.perf_counter()
+        for lat, lon in centres:
+            query(lat, lon)
+        return (time.perf_counter() - start) / len(centres)
+
+    def scalar_loop(self, points, lat, lon, radius):
+        # What nearby_employees/nearby_companies did before any pre-filter
+        matches = [(haversine(lon, lat, plon, plat), pk) for pk, plat, plon in points]
+        return sorted(match for match in matches if match[0] <= radius)
+
+    def boxed_loop(self, points, lat, lon, radius):
+        # Bounding-box pre-filter followed by the scalar check
+        box = bounding_box(lat, lon, radius)
+        matches = []
+        for pk, plat, plon in points:
+            if in_bounding_box(box, plat, plon):
+                dist = haversine(lon, lat, plon, plat)
+                if dist <= radius:
+                    matches.append((dist, pk))
+        return sorted(matches)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.models import JobPost
+from apps.expiry import expire_job_posts
+
+class Command(BaseCommand):
+    help = 'Move posted jobs whose plan window has run out back to draft in a single bulk update.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many job posts would be expired',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        if options['dry_run']:
+            count = JobPost.objects.expired(now).count()
+            self.stdout.write(self.style.WARNING(f'{count} job posts would be expired.'))
+            return
+        count = expire_job_posts(now)
+        self.stdout.write(self.style.SUCCESS(f'Expired {count} job posts.'))
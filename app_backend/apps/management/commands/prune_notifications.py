@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.retention import id_bound, next_batch, prunable_notifications, prune_batch, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        'Archive (or delete) read notifications older than the retention period, '
+        'in short keyset batches so the notification table stays small without long locks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention in days (default: settings.NOTIFICATION_RETENTION_DAYS)')
+        parser.add_argument('--mode', choices=['archive', 'delete'], default='archive')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows moved per transaction')
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between batches')
+        parser.add_argument('--after-id', type=int, default=0, help='Resume after this notification id (printed with every batch)')
+        parser.add_argument('--limit', type=int, help='Stop after this many rows')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many notifications would be pruned')
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['days'])
+        if options['dry_run']:
+            count = prunable_notifications(cutoff).filter(id__gt=options['after_id']).count()
+            self.stdout.write(self.style.WARNING(f'{count} read notifications created before {cutoff:%Y-%m-%d %H:%M} would be pruned.'))
+            return
+
+        archive = options['mode'] == 'archive'
+        verb = 'archived' if archive else 'deleted'
+        bound = id_bound(cutoff)
+        last_id = options['after_id']
+        pruned = 0
+        started = time.monotonic()
+        while options['limit'] is None or pruned < options['limit']:
+            size = options['batch_size'] if options['limit'] is None else min(options['batch_size'], options['limit'] - pruned)
+            batch = next_batch(cutoff, last_id, size, bound)
+            if not batch:
+                break
+            pruned += prune_batch(batch, archive=archive)
+            last_id = batch[-1]
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{pruned} notifications {verb}, {pruned / elapsed:.0f} rows/s (resume with --after-id {last_id})'
+            )
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb.capitalize()} {pruned} read notifications created before {cutoff:%Y-%m-%d %H:%M} in {elapsed:.1f}s '
+            f'({pruned / elapsed if elapsed else 0:.0f} rows/s).'
+        ))
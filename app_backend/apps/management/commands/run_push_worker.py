@@ -0,0 +1,83 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.fanout import claim_fanout, run_fanout
+from apps.outbox import run_once
+
+class Command(BaseCommand):
+    help = 'Run queued "New Job Match" fan-outs and deliver push notifications from the outbox; run as many workers as needed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Deliveries claimed per batch')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent sends per batch')
+        parser.add_argument('--max-attempts', type=int, default=5, help='Give up on a delivery after this many tries')
+        parser.add_argument('--lease', type=int, default=60, help='Seconds a claimed batch is reserved for this worker')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when nothing is due')
+        parser.add_argument('--fanout-chunk-size', type=int, default=500, help='Recipients per fan-out chunk (one FCM send_each call)')
+        parser.add_argument('--fanout-max-attempts', type=int, default=5, help='Give up on a fan-out after this many tries')
+        parser.add_argument('--once', action='store_true', help='Exit once nothing is due instead of polling')
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retrying': 0, 'failed': 0}
+        started = time.monotonic()
+        self.stdout.write('Push worker started.')
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='push') as executor:
+            try:
+                while True:
+                    close_old_connections()
+                    fanout = claim_fanout(lease_seconds=max(options['lease'], 300))
+                    if fanout is not None:
+                        self.run_fanout(fanout, executor, options)
+                        continue
+                    batch_started = time.monotonic()
+                    counts = run_once(options['batch_size'], executor, options['max_attempts'], options['lease'])
+                    if counts is None:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+                    for key, value in counts.items():
+                        totals[key] += value
+                    elapsed = time.monotonic() - batch_started
+                    self.stdout.write(
+                        f"Batch: {counts['sent']} sent, {counts['retrying']} retrying, {counts['failed']} failed "
+                        f"in {elapsed:.2f}s ({sum(counts.values()) / elapsed:.1f}/s)"
+                    )
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING('Interrupted; claimed deliveries are retried once their lease lapses.'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Push worker done in {time.monotonic() - started:.1f}s: {totals['sent']} sent, "
+            f"{totals['retrying']} scheduled for retry, {totals['failed']} failed."
+        ))
+
+    def run_fanout(self, fanout, executor, options):
+        started = time.monotonic()
+        self.stdout.write(f'Fan-out for job {fanout.job_id}: starting after employee {fanout.last_employee_id}...')
+
+        def report(size, counts):
+            self.stdout.write(
+                f"Fan-out for job {fanout.job_id}: {size} notified, {counts['sent']} pushed, "
+                f"{counts['failed']} failed, {counts['retrying']} left to retry"
+            )
+
+        try:
+            fanout = run_fanout(
+                fanout, executor, options['fanout_chunk_size'], options['max_attempts'], options['lease'], on_chunk=report,
+                fanout_attempts=options['fanout_max_attempts'],
+            )
+        except Exception as e:
+            fanout.refresh_from_db()
+            if fanout.status == 'pending':
+                self.stdout.write(self.style.WARNING(
+                    f'Fan-out for job {fanout.job_id} attempt {fanout.attempts} failed: {e}; '
+                    f'retrying after employee {fanout.last_employee_id} at {fanout.next_attempt_at:%H:%M:%S}.'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'Fan-out for job {fanout.job_id} failed after {fanout.attempts} attempts: {e}'))
+            return
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Fan-out for job {fanout.job_id} done: {fanout.notified} of {fanout.total_recipients} notified '
+            f'in {elapsed:.1f}s ({fanout.notified / elapsed if elapsed else 0:.0f}/s).'
+        ))
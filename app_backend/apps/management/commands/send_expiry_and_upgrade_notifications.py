@@ -1,9 +1,13 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils import timezone
 from apps.models import JobPost, EmployerRegistration, Notification
-from apps.sns_utils import send_fcm_notification, send_sns_notification
+from apps.outbox import notify_once
 from datetime import timedelta
 
+# Notifications inserted per INSERT ... ON CONFLICT DO NOTHING statement
+BATCH_SIZE = 500
+
 class Command(BaseCommand):
     help = 'Send job post expiry reminders and upgrade warnings to employers.'
 
@@ -13,103 +17,60 @@ class Command(BaseCommand):
         self.send_upgrade_warnings()
         self.stdout.write(self.style.SUCCESS('Expiry and upgrade notifications sent.'))
 
+    def queue(self, notifications, kind):
+        # The dedup_key unique index decides what was sent before; pushes go out via run_push_worker
+        sent = 0
+        for start in range(0, len(notifications), BATCH_SIZE):
+            sent += len(notify_once(notifications[start:start + BATCH_SIZE]))
+        self.stdout.write(f'{kind}: {sent} queued, {len(notifications) - sent} already sent.')
+
     def send_expiry_reminders(self, now):
-        plans = {
-            'silver': 5,
-            'gold': 30,
-        }
-        for plan, days in plans.items():
-            # Reminder 5 days before expiry
-            reminder_delta = timedelta(days=days-5)
-            expiry_delta = timedelta(days=days)
-            jobs = JobPost.objects.filter(condition='posted', employer__subscription_type=plan)
+        notifications = []
+        for plan, days in EmployerRegistration.PLAN_VALIDITY_DAYS.items():
+            # Only posts exactly days-5 (reminder) or days (expiry) whole days old
+            windows = [(now - timedelta(days=age + 1), now - timedelta(days=age)) for age in (days - 5, days)]
+            jobs = JobPost.objects.filter(condition='posted', employer__subscription_type=plan).select_related('employer')
+            jobs = jobs.filter(
+                (Q(created_at__gt=windows[0][0]) & Q(created_at__lte=windows[0][1]))
+                | (Q(created_at__gt=windows[1][0]) & Q(created_at__lte=windows[1][1]))
+            )
             for job in jobs:
                 created = job.created_at
                 employer = job.employer
                 # Reminder 5 days before expiry
                 if (now - created).days == (days - 5):
-                    if not Notification.objects.filter(
+                    notifications.append(Notification(
                         employer=employer,
                         user_type='employer',
-                        title__icontains='Job Post Expiry Reminder',
-                        message__icontains=job.job_title
-                    ).exists():
-                        msg = f'Your job post "{job.job_title}" will expire in 5 days. Please take action if needed.'
-                        Notification.objects.create(
-                            employer=employer,
-                            user_type='employer',
-                            title='Job Post Expiry Reminder',
-                            message=msg
-                        )
-                        if employer.fcm_token:
-                            send_fcm_notification(
-                                title='Job Post Expiry Reminder',
-                                body=msg,
-                                fcm_token=employer.fcm_token
-                            )
-                        else:
-                            send_sns_notification(
-                                subject='Job Post Expiry Reminder',
-                                message=msg,
-                                device_token=employer.device_token
-                            )
+                        title='Job Post Expiry Reminder',
+                        message=f'Your job post "{job.job_title}" will expire in 5 days. Please take action if needed.',
+                        dedup_key=f'expiry_reminder:job:{job.id}',
+                    ))
                 # On expiry
                 if (now - created).days == days:
-                    if not Notification.objects.filter(
+                    notifications.append(Notification(
                         employer=employer,
                         user_type='employer',
-                        title__icontains='Job Post Expired',
-                        message__icontains=job.job_title
-                    ).exists():
-                        msg = f'Your job post "{job.job_title}" has expired.'
-                        Notification.objects.create(
-                            employer=employer,
-                            user_type='employer',
-                            title='Job Post Expired',
-                            message=msg
-                        )
-                        if employer.fcm_token:
-                            send_fcm_notification(
-                                title='Job Post Expired',
-                                body=msg,
-                                fcm_token=employer.fcm_token
-                            )
-                        else:
-                            send_sns_notification(
-                                subject='Job Post Expired',
-                                message=msg,
-                                device_token=employer.device_token
-                            )
+                        title='Job Post Expired',
+                        message=f'Your job post "{job.job_title}" has expired.',
+                        dedup_key=f'job_expired:job:{job.id}',
+                    ))
+        self.queue(notifications, 'Expiry notifications')
 
     def send_upgrade_warnings(self):
-        employers = EmployerRegistration.objects.all()
-        for employer in employers:
-            if employer.no_of_post is not None and 1 <= employer.no_of_post <= 5:
-                if not Notification.objects.filter(
-                    employer=employer,
-                    user_type='employer',
-                    title__icontains='Upgrade Warning',
-                    message__icontains=str(employer.no_of_post)
-                ).exists():
-                    msg = f'You have only {employer.no_of_post} job post credits left. Please upgrade your plan soon.'
-                    Notification.objects.create(
-                        employer=employer,
-                        user_type='employer',
-                        title='Upgrade Warning',
-                        message=msg
-                    )
-                    if employer.fcm_token:
-                        send_fcm_notification(
-                            title='Upgrade Warning',
-                            body=msg,
-                            fcm_token=employer.fcm_token
-                        )
-                    else:
-                        send_sns_notification(
-                            subject='Upgrade Warning',
-                            message=msg,
-                            device_token=employer.device_token
-                        )
+        employers = EmployerRegistration.objects.filter(no_of_post__gte=1, no_of_post__lte=5)
+        notifications = [
+            Notification(
+                employer=employer,
+                user_type='employer',
+                title='Upgrade Warning',
+                message=f'You have only {employer.no_of_post} job post credits left. Please upgrade your plan soon.',
+                # One warning per credit count, as before
+                dedup_key=f'upgrade_warning:employer:{employer.employer_id}:{employer.no_of_post}',
+            )
+            for employer in employers
+        ]
+        self.queue(notifications, 'Upgrade warnings')
 
     def setup_test_data(self):
         """
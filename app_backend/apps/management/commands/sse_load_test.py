@@ -0,0 +1,122 @@
+import asyncio
+import random
+import statistics
+import time
+from urllib.parse import urlsplit
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from apps.models import EmployeeRegistration, Notification
+
+
+def rss_kb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Open many idle SSE notification streams against a running ASGI server, then create notifications '
+        'for some of the connected employees and report connect time, delivery latency and server memory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/notifications/stream/')
+        parser.add_argument('--connections', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=200, help='Connections being opened at once')
+        parser.add_argument('--idle', type=float, default=10, help='Seconds to hold the connections idle before notifying')
+        parser.add_argument('--notify', type=int, default=100, help='Notifications to create for connected employees')
+        parser.add_argument('--server-pid', type=int, help='ASGI worker pid, to report its memory per connection')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('--url must be an http:// URL.')
+        employee_ids = list(
+            EmployeeRegistration.objects.order_by('employee_id').values_list('employee_id', flat=True)[:options['connections']]
+        )
+        if not employee_ids:
+            raise CommandError('No employees to connect as.')
+        asyncio.run(self.run(url, employee_ids, options))
+
+    async def run(self, url, employee_ids, options):
+        pid = options['server_pid']
+        rss_before = rss_kb(pid) if pid else None
+        received = {}
+        streams = []
+        failures = []
+        gate = asyncio.Semaphore(options['concurrency'])
+
+        async def open_stream(employee_id):
+            async with gate:
+                try:
+                    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+                    writer.write(
+                        f'GET {url.path}?employee_id={employee_id} HTTP/1.1\r\nHost: {url.netloc}\r\n'
+                        f'Accept: text/event-stream\r\n\r\n'.encode()
+                    )
+                    status = await reader.readline()
+                    if b' 200 ' not in status:
+                        raise ValueError(status.decode().strip())
+                    while (await reader.readline()) not in (b'\r\n', b''):
+                        pass
+                except Exception as e:
+                    failures.append(f'{type(e).__name__}: {e}')
+                    return
+            streams.append((employee_id, reader, writer, asyncio.ensure_future(read_events(reader))))
+
+        async def read_events(reader):
+            while line := await reader.readline():
+                # Chunked framing lines are skipped; only "id:" lines matter here
+                if line.startswith(b'id: '):
+                    received.setdefault(int(line[4:]), time.perf_counter())
+
+        started = time.perf_counter()
+        connections = [employee_ids[i % len(employee_ids)] for i in range(options['connections'])]
+        await asyncio.gather(*(open_stream(employee_id) for employee_id in connections))
+        connect_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f'{len(streams)} streams open, {len(failures)} failed, in {connect_seconds:.1f}s '
+            f'({len(streams) / connect_seconds:.0f} connections/s)'
+        )
+        for failure in failures[:5]:
+            self.stdout.write(self.style.ERROR(failure))
+
+        await asyncio.sleep(options['idle'])
+        if pid:
+            rss_idle = rss_kb(pid)
+            per_connection = (rss_idle - rss_before) / len(streams) if streams else 0
+            self.stdout.write(
+                f'server RSS {rss_before / 1024:.1f} MB -> {rss_idle / 1024:.1f} MB with {len(streams)} idle streams '
+                f'({per_connection:.1f} KB per stream)'
+            )
+
+        # Employees with at least one open stream, notified one at a time through the normal save path
+        connected = sorted({employee_id for employee_id, *_ in streams})
+        targets = random.sample(connected, min(options['notify'], len(connected))) if streams else []
+        created = {}
+        for employee_id in targets:
+            sent_at = time.perf_counter()
+            notification = await sync_to_async(Notification.objects.create)(
+                employee_id=employee_id, user_type='employee', title='Load test', message='sse_load_test'
+            )
+            created[notification.pk] = sent_at
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(3)
+
+        latencies = sorted((received[pk] - sent_at) * 1000 for pk, sent_at in created.items() if pk in received)
+        if latencies:
+            self.stdout.write(
+                f'{len(latencies)}/{len(created)} notifications delivered: p50 {statistics.median(latencies):.1f}ms, '
+                f'p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}ms, max {latencies[-1]:.1f}ms'
+            )
+        elif created:
+            self.stdout.write(self.style.ERROR(f'0/{len(created)} notifications delivered'))
+        await sync_to_async(lambda: Notification.objects.filter(pk__in=list(created)).delete())()
+
+        for _, _, writer, reading in streams:
+            reading.cancel()
+            writer.close()
+        self.stdout.write(self.style.SUCCESS(f'Held {len(streams)} streams; {len(failures)} failed to connect.'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:14
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+# Plan windows as they stood when expires_at was introduced.
+PLAN_VALIDITY_DAYS = {
+    'silver': 5,
+    'gold': 30,
+}
+
+
+def backfill_expires_at(apps, schema_editor):
+    JobPost = apps.get_model('apps', 'JobPost')
+    for plan, days in PLAN_VALIDITY_DAYS.items():
+        JobPost.objects.filter(employer__subscription_type=plan).update(
+            expires_at=F('created_at') + timedelta(days=days)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0027_remove_companycertificate_certificate_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, help_text='When the post drops back to draft; empty for plans without expiry', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['condition', 'expires_at'], name='job_post_condition_expires'),
+        ),
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0028_jobpost_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favjob',
+            index=models.Index(fields=['employee', 'created_at', 'id'], name='fav_jobs_employee_created'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['created_at', 'id'], name='job_post_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['employer', 'created_at', 'id'], name='job_post_employer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['employee', 'created_at', 'id'], name='notification_employee_created'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['employer', 'created_at', 'id'], name='notification_employer_created'),
+        ),
+        migrations.AddIndex(
+            model_name='viewedjob',
+            index=models.Index(fields=['employer', 'applied', 'viewed_at', 'id'], name='viewed_jobs_employer_applied'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:17
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0029_list_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['condition', 'education', 'gender', 'marital_status'], name='job_post_feed_match'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['district'], name='job_post_district_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['city'], name='job_post_city_gin'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:18
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, OuterRef, Subquery, TextField, Value
+
+
+def build_search_index(apps, schema_editor):
+    JobPost = apps.get_model('apps', 'JobPost')
+    EmployerRegistration = apps.get_model('apps', 'EmployerRegistration')
+    company_name = Subquery(
+        EmployerRegistration.objects.filter(employer_id=OuterRef('employer_id')).values('company_name')[:1]
+    )
+    skills = Func(F('required_skills'), Value(' '), function='array_to_string', output_field=TextField())
+    JobPost.objects.update(search_vector=(
+        SearchVector('job_title', weight='A', config='english')
+        + SearchVector(skills, weight='B', config='english')
+        + SearchVector(company_name, weight='B', config='english')
+        + SearchVector('job_description', weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0030_jobpost_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_post_search_gin'),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
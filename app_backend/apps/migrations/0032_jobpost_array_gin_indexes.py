@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:18
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0031_jobpost_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['required_skills'], name='job_post_skills_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['physically_challenged'], name='job_post_pc_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['special_benefits'], name='job_post_benefits_gin'),
+        ),
+    ]
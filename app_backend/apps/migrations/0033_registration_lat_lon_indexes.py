@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0032_jobpost_array_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeregistration',
+            index=models.Index(fields=['latitude', 'longitude'], name='employee_reg_lat_lon'),
+        ),
+        migrations.AddIndex(
+            model_name='employerregistration',
+            index=models.Index(fields=['latitude', 'longitude'], name='employer_reg_lat_lon'),
+        ),
+    ]
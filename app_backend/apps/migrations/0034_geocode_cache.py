@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0033_registration_lat_lon_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('forward', 'Forward'), ('reverse', 'Reverse')], max_length=10)),
+                ('key', models.CharField(max_length=255)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'geocode_cache',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='geocodecache',
+            constraint=models.UniqueConstraint(fields=('kind', 'key'), name='geocode_cache_kind_key'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0035_push_delivery_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFanout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('total_recipients', models.IntegerField(blank=True, null=True)),
+                ('notified', models.IntegerField(default=0)),
+                ('pushes_sent', models.IntegerField(default=0)),
+                ('pushes_failed', models.IntegerField(default=0)),
+                ('pushes_queued', models.IntegerField(default=0)),
+                ('last_employee_id', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fanout', to='apps.jobpost')),
+            ],
+            options={
+                'db_table': 'job_fanout',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='job_fanout_status_created')],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:54
+
+import re
+
+from django.db import migrations, models
+
+# Messages as send_expiry_and_upgrade_notifications wrote them before dedup keys.
+REMINDER_MESSAGE = 'Your job post "{}" will expire in 5 days. Please take action if needed.'
+EXPIRED_MESSAGE = 'Your job post "{}" has expired.'
+UPGRADE_MESSAGE = re.compile(r'You have only (\d+) job post credits left')
+
+
+def backfill_dedup_keys(apps, schema_editor):
+    """Key the reminders already sent, so the first keyed run does not send them again."""
+    Notification = apps.get_model('apps', 'Notification')
+    JobPost = apps.get_model('apps', 'JobPost')
+    sent = Notification.objects.filter(
+        user_type='employer', title__in=['Job Post Expiry Reminder', 'Job Post Expired', 'Upgrade Warning']
+    ).order_by('id').values_list('id', 'employer_id', 'title', 'message')
+    first_sent = {}  # (employer_id, message) -> id of the earliest such notification
+    keys = {}  # notification id -> dedup key
+    for pk, employer_id, title, message in sent.iterator():
+        first_sent.setdefault((employer_id, message), pk)
+        match = UPGRADE_MESSAGE.match(message)
+        if title == 'Upgrade Warning' and match and first_sent[(employer_id, message)] == pk:
+            keys[pk] = f'upgrade_warning:employer:{employer_id}:{match.group(1)}'
+    if not first_sent:
+        return
+
+    employer_ids = {employer_id for employer_id, _ in first_sent}
+    for job_id, employer_id, title in JobPost.objects.filter(employer_id__in=employer_ids).order_by('id').values_list(
+        'id', 'employer_id', 'job_title'
+    ).iterator():
+        for prefix, template in (('expiry_reminder', REMINDER_MESSAGE), ('job_expired', EXPIRED_MESSAGE)):
+            pk = first_sent.get((employer_id, template.format(title)))
+            # Two posts with the same title shared one reminder; only the first gets its key
+            if pk is not None and pk not in keys:
+                keys[pk] = f'{prefix}:job:{job_id}'
+    for pk, key in keys.items():
+        Notification.objects.filter(pk=pk).update(dedup_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0038_notification_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='dedup_key',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_dedup_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('dedup_key__isnull', False)), fields=('dedup_key',), name='notification_dedup_key'),
+        ),
+    ]
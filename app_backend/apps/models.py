@@ -2,6 +2,8 @@ from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 # Create your models here.
 
@@ -87,11 +89,20 @@ class EmployeeRegistration(models.Model):
         db_table = 'employee_registration'
         verbose_name = 'Employee Registration'
         verbose_name_plural = 'Employee Registrations'
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='employee_reg_lat_lon'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.phone_number}"
 
 class EmployerRegistration(models.Model):
+    # How long a job post stays live for each paid plan; free posts never expire.
+    PLAN_VALIDITY_DAYS = {
+        'silver': 5,
+        'gold': 30,
+    }
+
     employer_id = models.AutoField(primary_key=True)
     phone_number = models.CharField(max_length=15, unique=True)
     district = models.CharField(max_length=50, null=True, blank=True)
@@ -124,10 +135,20 @@ class EmployerRegistration(models.Model):
         db_table = 'employer_registration'
         verbose_name = 'Employer Registration'
         verbose_name_plural = 'Employer Registrations'
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='employer_reg_lat_lon'),
+        ]
 
     def __str__(self):
         return f"{self.company_name} - {self.phone_number}"
 
+    def job_post_expiry(self, start):
+        """Return when a job post published at `start` expires under the current plan, or None."""
+        days = self.PLAN_VALIDITY_DAYS.get(self.subscription_type)
+        if days is None:
+            return None
+        return start + timedelta(days=days)
+
 class ViewedCandidate(models.Model):
     employer = models.ForeignKey(EmployerRegistration, on_delete=models.CASCADE)
     employee = models.ForeignKey(EmployeeRegistration, on_delete=models.CASCADE)
@@ -176,6 +197,80 @@ class EmployerFeedback(models.Model):
     def __str__(self):
         return f"Feedback by {self.employer_id} - {self.rating} stars"
 
+class JobPostQuerySet(models.QuerySet):
+    def live(self, now=None):
+        """Posted jobs whose plan window has not run out yet."""
+        now = now or timezone.now()
+        return self.filter(condition='posted').filter(
+            models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=now)
+        )
+
+    def expired(self, now=None):
+        """Posted jobs past their expiry that the expiry engine has not swept yet."""
+        now = now or timezone.now()
+        return self.filter(condition='posted', expires_at__lte=now)
+
+    def with_employer_fields(self):
+        """Join the employer once and expose the fields JobPostSerializer shows as flat columns."""
+        return self.annotate(
+            company_name=models.F('employer__company_name'),
+            employer_location=models.F('employer__location'),
+            employer_subscription_type=models.F('employer__subscription_type'),
+            employer_photo=models.F('employer__photo'),
+        )
+
+    def matching(self, employee, now=None):
+        """
+        Live posts the employee qualifies for, annotated with ``match_score`` and
+        ordered best match first.
+
+        A post matches when the employee's district or city is listed on it (or it
+        lists neither), their age is within min_age..max_age, their education is at
+        least the required level, and the gender/marital preferences admit them.
+        An employee with a missing or unknown education level matches nothing.
+        """
+        model = self.model
+        district_match = models.Q(district__contains=[employee.district])
+        city_match = models.Q(city__contains=[employee.city])
+        anywhere = models.Q(district__len=0, city__len=0)
+
+        genders = ['anyone']
+        gender = model.EMPLOYEE_GENDER.get(employee.gender)
+        if gender:
+            genders.append(gender)
+        marital_statuses = ['anyone', 'not_preferred']
+        marital_status = model.EMPLOYEE_MARITAL_STATUS.get(employee.marital_status)
+        if marital_status:
+            marital_statuses.append(marital_status)
+
+        queryset = self.live(now).filter(
+            district_match | city_match | anywhere,
+            min_age__lte=employee.age,
+            max_age__gte=employee.age,
+            gender__in=genders,
+            marital_status__in=marital_statuses,
+        )
+        levels = [code for code, _ in model.EDUCATION_CHOICES]
+        if employee.education_level in levels:
+            queryset = queryset.filter(education__in=levels[:levels.index(employee.education_level) + 1])
+        else:
+            # Without a known level we cannot tell what they qualify for, so nothing matches
+            queryset = queryset.none()
+
+        def score(condition, points):
+            return models.Case(models.When(condition, then=models.Value(points)), default=models.Value(0))
+
+        return queryset.annotate(
+            match_score=(
+                score(district_match, 3)
+                + score(city_match, 2)
+                + score(models.Q(gender=gender), 1)
+                + score(models.Q(marital_status=marital_status), 1)
+                + score(models.Q(education=employee.education_level), 1)
+            ),
+        ).order_by('-match_score', '-created_at', '-id')
+
+
 class JobPost(models.Model):
     DURATION_CHOICES = [
         ('daily', 'Daily'),
@@ -196,6 +291,19 @@ class JobPost(models.Model):
         ('posted', 'Posted'),
         ('draft', 'Draft'),
     ]
+    # EmployeeRegistration codes -> the job preference they satisfy
+    EMPLOYEE_GENDER = {
+        'M': 'male',
+        'F': 'female',
+        'O': 'others',
+    }
+    # Jobs have no widowed preference; a widowed employee is not married
+    EMPLOYEE_MARITAL_STATUS = {
+        'S': 'unmarried',
+        'M': 'married',
+        'D': 'divorced',
+        'W': 'unmarried',
+    }
 
     job_title = models.CharField(max_length=100)
     min_salary = models.PositiveIntegerField()
@@ -238,15 +346,42 @@ class JobPost(models.Model):
     marital_status = models.CharField(max_length=15, choices=MARITAL_STATUS_CHOICES, default='not_preferred', help_text='Preferred marital status for the job')
     min_age = models.PositiveIntegerField(default=18, help_text='Minimum age for the job')
     max_age = models.PositiveIntegerField(default=80, help_text='Maximum age for the job')
+    expires_at = models.DateTimeField(null=True, blank=True, help_text='When the post drops back to draft; empty for plans without expiry')
+    # Maintained by apps.signals, see apps/search.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = JobPostQuerySet.as_manager()
 
     class Meta:
         db_table = 'job_post'
         verbose_name = 'Job Post'
         verbose_name_plural = 'Job Posts'
+        indexes = [
+            models.Index(fields=['condition', 'expires_at'], name='job_post_condition_expires'),
+            models.Index(fields=['created_at', 'id'], name='job_post_created_id'),
+            models.Index(fields=['employer', 'created_at', 'id'], name='job_post_employer_created'),
+            models.Index(fields=['condition', 'education', 'gender', 'marital_status'], name='job_post_feed_match'),
+            GinIndex(fields=['district'], name='job_post_district_gin'),
+            GinIndex(fields=['city'], name='job_post_city_gin'),
+            GinIndex(fields=['required_skills'], name='job_post_skills_gin'),
+            GinIndex(fields=['physically_challenged'], name='job_post_pc_gin'),
+            GinIndex(fields=['special_benefits'], name='job_post_benefits_gin'),
+            GinIndex(fields=['search_vector'], name='job_post_search_gin'),
+        ]
 
     def __str__(self):
         return f"{self.job_title} - {self.employer.company_name}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.expires_at is None and self.employer_id:
+            self.expires_at = self.employer.job_post_expiry(timezone.now())
+        super().save(*args, **kwargs)
+
+    def is_expired(self, now=None):
+        if self.condition != 'posted' or self.expires_at is None:
+            return False
+        return self.expires_at <= (now or timezone.now())
+
 class FavJob(models.Model):
     employee = models.ForeignKey(EmployeeRegistration, on_delete=models.CASCADE)
     job = models.ForeignKey(JobPost, on_delete=models.CASCADE)
@@ -259,6 +394,9 @@ class FavJob(models.Model):
         verbose_name = 'Favorite Job'
         verbose_name_plural = 'Favorite Jobs'
         unique_together = ('employee', 'job', 'employer')
+        indexes = [
+            models.Index(fields=['employee', 'created_at', 'id'], name='fav_jobs_employee_created'),
+        ]
 
     def __str__(self):
         return f"{self.employee} - {self.job} (Employer: {self.employer})"
@@ -275,6 +413,9 @@ class ViewedJob(models.Model):
         verbose_name = 'Viewed Job'
         verbose_name_plural = 'Viewed Jobs'
         unique_together = ('job_post', 'employer', 'employee')
+        indexes = [
+            models.Index(fields=['employer', 'applied', 'viewed_at', 'id'], name='viewed_jobs_employer_applied'),
+        ]
 
     def __str__(self):
         return f"{self.job_post} viewed by {self.employee} (Employer: {self.employer}) at {self.viewed_at}"
@@ -291,12 +432,33 @@ class Notification(models.Model):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set on notifications that must go out at most once, e.g. "expiry_reminder:job:42"; see outbox.notify_once
+    dedup_key = models.CharField(max_length=100, null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
         db_table = 'notification'
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
+        indexes = [
+            models.Index(fields=['employee', 'created_at', 'id'], name='notification_employee_created'),
+            models.Index(fields=['employer', 'created_at', 'id'], name='notification_employer_created'),
+            # Only unread rows: unread counts are index-only scans and ?unread=true pages skip read history
+            models.Index(
+                fields=['employee', 'created_at', 'id'], condition=models.Q(is_read=False),
+                name='notification_employee_unread',
+            ),
+            models.Index(
+                fields=['employer', 'created_at', 'id'], condition=models.Q(is_read=False),
+                name='notification_employer_unread',
+            ),
+        ]
+        constraints = [
+            # Partial, so the index only holds keyed rows
+            models.UniqueConstraint(
+                fields=['dedup_key'], condition=models.Q(dedup_key__isnull=False), name='notification_dedup_key',
+            ),
+        ]
 
     def __str__(self):
         if self.user_type == 'employee' and self.employee:
@@ -304,3 +466,129 @@ class Notification(models.Model):
         elif self.user_type == 'employer' and self.employer:
             return f"To {self.employer.company_name}: {self.title} ({'Read' if self.is_read else 'Unread'})"
         return self.title
+
+
+class PushDelivery(models.Model):
+    """
+    Outbox row for one push of a Notification, written in the same transaction
+    as the notification and delivered later by the run_push_worker command.
+    """
+    CHANNEL_CHOICES = [
+        ('fcm', 'FCM token'),
+        ('sns', 'SNS endpoint or topic'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='deliveries')
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+    # FCM registration token or SNS endpoint ARN; empty for the SNS topic
+    target = models.CharField(max_length=255, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    # When a pending row may next be tried, or when a worker's claim on a sending row lapses
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    provider_message_id = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'push_delivery'
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                name='push_delivery_due',
+                condition=models.Q(status__in=['pending', 'sending']),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} push for notification {self.notification_id} ({self.status})"
+
+class JobFanout(models.Model):
+    """
+    Progress of the "New Job Match" notifications for one job post. Created with
+    the post and worked off in chunks by run_push_worker (see apps/fanout.py).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    job = models.OneToOneField(JobPost, on_delete=models.CASCADE, related_name='fanout')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    total_recipients = models.IntegerField(null=True, blank=True)
+    notified = models.IntegerField(default=0)
+    pushes_sent = models.IntegerField(default=0)
+    pushes_failed = models.IntegerField(default=0)
+    # Handed to the outbox: SNS pushes, and FCM pushes waiting for a retry
+    pushes_queued = models.IntegerField(default=0)
+    # Keyset checkpoint, so a retried or interrupted fan-out resumes where it stopped
+    last_employee_id = models.IntegerField(default=0)
+    # Claims so far; an error puts the fan-out back to pending with backoff until it runs out of attempts
+    attempts = models.IntegerField(default=0)
+    # When a pending fan-out may next be claimed
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'job_fanout'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='job_fanout_status_created'),
+        ]
+
+    def __str__(self):
+        return f"Fan-out for job {self.job_id} ({self.status})"
+
+class GeocodeCache(models.Model):
+    """Second-level geocoding cache shared by every worker, see apps/geocoding.py."""
+    KIND_CHOICES = [
+        ('forward', 'Forward'),
+        ('reverse', 'Reverse'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # Normalized address, or "lat,lon" rounded to settings.GEOCODE_REVERSE_PRECISION
+    key = models.CharField(max_length=255)
+    # [longitude, latitude] for forward lookups, the place name for reverse ones; null when nothing matched
+    result = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'geocode_cache'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='geocode_cache_kind_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.key}"
+
+class NotificationArchive(models.Model):
+    """
+    Read notifications moved out of the notification table by the
+    prune_notifications command, see apps/retention.py. Keeps the original id
+    and no foreign keys or secondary indexes, so archiving stays a cheap append.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user_type = models.CharField(max_length=10, choices=Notification.NOTIFY_USER_TYPE)
+    # employee_id or employer_id, depending on user_type
+    recipient_id = models.BigIntegerField()
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'notification_archive'
+
+    def __str__(self):
+        return f"{self.user_type} {self.recipient_id}: {self.title}"
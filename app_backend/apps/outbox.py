@@ -0,0 +1,236 @@
+"""
+Transactional outbox for push notifications.
+
+Views call notify(), which writes the Notification and a pending PushDelivery
+in one transaction and does no network I/O. The run_push_worker command claims
+due deliveries with SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers
+can run side by side. It sends them concurrently (FCM in send_each batches)
+and records the outcome. Failed sends are retried with exponential backoff up
+to a maximum number of attempts. Errors that cannot succeed on retry (an
+unregistered token, a disabled endpoint) fail at once.
+
+A claimed row is marked "sending" with a lease in next_attempt_at. If a worker
+dies mid-batch, the row becomes claimable again when the lease runs out.
+"""
+from datetime import timedelta
+
+from botocore.exceptions import ClientError
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification, PushDelivery
+from .streaming import publish_notifications
+
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+PERMANENT_SNS_ERRORS = {'EndpointDisabled', 'InvalidParameter', 'NotFound'}
+
+
+def push_target(recipient):
+    """Route a push like the views always have: raw FCM token first, then the SNS endpoint, then the SNS topic."""
+    if getattr(recipient, 'fcm_token', None):
+        return {'channel': 'fcm', 'target': recipient.fcm_token}
+    return {'channel': 'sns', 'target': recipient.device_token or None}
+
+
+def notify(title, message, employee=None, employer=None):
+    """Create a Notification for one recipient and queue its push, atomically."""
+    recipient = employee or employer
+    with transaction.atomic():
+        notification = Notification.objects.create(
+            employee=employee,
+            employer=employer,
+            user_type='employee' if employee else 'employer',
+            title=title,
+            message=message,
+        )
+        PushDelivery.objects.create(notification=notification, **push_target(recipient))
+    return notification
+
+
+def notify_once(notifications):
+    """
+    Insert unsaved Notifications that carry a dedup_key, skipping every key that
+    already exists (INSERT ... ON CONFLICT DO NOTHING), and queue pushes for the
+    ones inserted. Safe to run again over the same batch. Returns the inserted
+    notifications.
+    """
+    notifications = list({notification.dedup_key: notification for notification in notifications}.values())
+    if not notifications:
+        return []
+    now = timezone.now()
+    columns = ['employee_id', 'employer_id', 'user_type', 'title', 'message', 'is_read', 'created_at', 'dedup_key']
+    rows = ', '.join(['(%s)' % ', '.join(['%s'] * len(columns))] * len(notifications))
+    params = []
+    for notification in notifications:
+        notification.created_at = now
+        params.extend(getattr(notification, column) for column in columns)
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Django's bulk_create(ignore_conflicts=True) cannot say which rows went in; RETURNING can
+        cursor.execute(
+            f'INSERT INTO {Notification._meta.db_table} ({", ".join(columns)}) VALUES {rows} '
+            'ON CONFLICT (dedup_key) WHERE dedup_key IS NOT NULL DO NOTHING RETURNING id, dedup_key',
+            params,
+        )
+        inserted_ids = dict((key, pk) for pk, key in cursor.fetchall())
+        inserted = []
+        for notification in notifications:
+            if notification.dedup_key in inserted_ids:
+                notification.pk = inserted_ids[notification.dedup_key]
+                inserted.append(notification)
+        PushDelivery.objects.bulk_create([
+            PushDelivery(notification=notification, **push_target(notification.employee or notification.employer))
+            for notification in inserted
+        ])
+        # A raw insert sends no post_save, so tell the live streams here
+        publish_notifications(inserted)
+    return inserted
+
+
+def claim_due_deliveries(limit, lease_seconds=60, now=None):
+    """
+    Lock up to ``limit`` due deliveries that no other worker holds, mark them
+    as sending under a lease and return them with their notifications.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        ids = list(
+            PushDelivery.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        PushDelivery.objects.filter(id__in=ids).update(
+            status='sending',
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=lease_seconds),
+        )
+    return list(PushDelivery.objects.filter(id__in=ids).select_related('notification'))
+
+
+def is_permanent(exc):
+    from firebase_admin import exceptions as firebase_exceptions, messaging
+
+    if isinstance(exc, (messaging.UnregisteredError, messaging.SenderIdMismatchError, firebase_exceptions.InvalidArgumentError)):
+        return True
+    if isinstance(exc, ClientError):
+        return exc.response.get('Error', {}).get('Code') in PERMANENT_SNS_ERRORS
+    return False
+
+
+def send_delivery(delivery):
+    """Push one delivery; returns the provider's message id or raises."""
+    from .sns_utils import publish_sns, send_fcm
+
+    notification = delivery.notification
+    if delivery.channel == 'fcm':
+        return send_fcm(notification.title, notification.message, delivery.target)
+    response = publish_sns(notification.title, notification.message, delivery.target)
+    return response.get('MessageId') if response else None
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def send_fcm_deliveries(deliveries):
+    """Push FCM deliveries with one send_each call; returns ``[(message_id, exception), ...]``."""
+    from .sns_utils import send_fcm_each
+
+    return send_fcm_each([(d.notification.title, d.notification.message, d.target) for d in deliveries])
+
+
+OUTCOME_COLUMNS = [
+    ('status', 'varchar'),
+    ('sent_at', 'timestamptz'),
+    ('provider_message_id', 'varchar'),
+    ('last_error', 'text'),
+    ('next_attempt_at', 'timestamptz'),
+]
+
+
+def record_outcomes(deliveries):
+    """
+    Write each delivery's outcome fields in one UPDATE ... FROM (VALUES ...).
+    bulk_update compiles a CASE per row and field, which costs seconds for a few
+    hundred rows. An upsert would re-insert a row deleted mid-batch (its
+    notification pruned) and fail the whole batch on the foreign key; an UPDATE
+    simply skips it.
+    """
+    if not deliveries:
+        return 0
+    row = '(%s, ' + ', '.join(f'%s::{cast}' for _, cast in OUTCOME_COLUMNS) + ')'
+    params = []
+    for delivery in deliveries:
+        params.append(delivery.pk)
+        params.extend(getattr(delivery, column) for column, _ in OUTCOME_COLUMNS)
+    names = [column for column, _ in OUTCOME_COLUMNS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {PushDelivery._meta.db_table} AS delivery SET '
+            + ', '.join(f'{name} = outcome.{name}' for name in names)
+            + f' FROM (VALUES {", ".join([row] * len(deliveries))}) AS outcome (id, {", ".join(names)})'
+            ' WHERE delivery.id = outcome.id',
+            params,
+        )
+        return cursor.rowcount
+
+
+def deliver(deliveries, executor, max_attempts=5, send=send_delivery, send_batch=send_fcm_deliveries):
+    """
+    Send claimed deliveries on ``executor`` (FCM in send_each batches, SNS one
+    publish each) and record the results with record_outcomes(). Returns
+    ``{'sent': n, 'retrying': n, 'failed': n}``.
+    """
+    from .sns_utils import FCM_BATCH_LIMIT
+
+    def attempt(delivery):
+        try:
+            return send(delivery), None
+        except Exception as e:
+            return None, e
+
+    def attempt_batch(batch):
+        try:
+            return send_batch(batch)
+        except Exception as e:
+            return [(None, e)] * len(batch)
+
+    fcm = [d for d in deliveries if d.channel == 'fcm']
+    other = [d for d in deliveries if d.channel != 'fcm']
+    batches = [executor.submit(attempt_batch, fcm[i:i + FCM_BATCH_LIMIT]) for i in range(0, len(fcm), FCM_BATCH_LIMIT)]
+    singles = executor.map(attempt, other)
+    results = [result for batch in batches for result in batch.result()] + list(singles)
+    deliveries = fcm + other
+
+    now = timezone.now()
+    counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+    for delivery, (message_id, error) in zip(deliveries, results):
+        if error is None:
+            delivery.status = 'sent'
+            delivery.sent_at = now
+            delivery.provider_message_id = str(message_id)[:255] if message_id else None
+            delivery.last_error = ''
+            counts['sent'] += 1
+        elif is_permanent(error) or delivery.attempts >= max_attempts:
+            delivery.status = 'failed'
+            delivery.last_error = f'{type(error).__name__}: {error}'
+            counts['failed'] += 1
+        else:
+            delivery.status = 'pending'
+            delivery.next_attempt_at = now + retry_delay(delivery.attempts)
+            delivery.last_error = f'{type(error).__name__}: {error}'
+            counts['retrying'] += 1
+    record_outcomes(deliveries)
+    return counts
+
+
+def run_once(batch_size, executor, max_attempts=5, lease_seconds=60, **senders):
+    """Claim and deliver one batch; returns the counts, or None when nothing was due."""
+    deliveries = claim_due_deliveries(batch_size, lease_seconds)
+    if not deliveries:
+        return None
+    return deliver(deliveries, executor, max_attempts, **senders)
@@ -0,0 +1,54 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, pk), newest first, so every page costs
+    the same index range scan no matter how deep the client scrolls.
+
+    While settings.API_LEGACY_LIST_RESPONSES is on, clients that do not ask for a
+    page (no ``cursor`` or ``page_size`` parameter), or that send
+    ``?paginate=false``, still get a bare list. That list is cut off at
+    settings.API_LEGACY_LIST_MAX_ROWS and carries a Warning header pointing at
+    the paginated form, plus X-Result-Truncated when rows were dropped. With the
+    setting off, every list is paginated and ``paginate=false`` is ignored.
+    """
+    ordering = ('-created_at', '-pk')
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    legacy_warning = '299 - "Unpaginated list responses are deprecated; send page_size or cursor"'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.legacy = not self.is_requested(request)
+        if self.legacy:
+            limit = settings.API_LEGACY_LIST_MAX_ROWS
+            rows = list(queryset[:limit + 1])
+            self.truncated = len(rows) > limit
+            return rows[:limit]
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self.legacy:
+            return super().get_paginated_response(data)
+        headers = {'Warning': self.legacy_warning}
+        if self.truncated:
+            headers['X-Result-Truncated'] = 'true'
+        return Response(data, headers=headers)
+
+    def is_requested(self, request):
+        if not settings.API_LEGACY_LIST_RESPONSES:
+            return True
+        params = request.query_params
+        if params.get('paginate', '').lower() in ('false', '0'):
+            return False
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+
+class UploadedAtCursorPagination(CreatedAtCursorPagination):
+    ordering = ('-uploaded_at', '-pk')
+
+
+class ViewedAtCursorPagination(CreatedAtCursorPagination):
+    ordering = ('-viewed_at', '-pk')
@@ -0,0 +1,73 @@
+"""
+Notification retention.
+
+Read notifications older than settings.NOTIFICATION_RETENTION_DAYS are copied
+into NotificationArchive and deleted, or just deleted, by the
+prune_notifications command. Unread notifications, and notifications with a
+dedup_key, are never touched. The work is done in keyset batches over the
+primary key. Each batch is one short transaction that locks only the rows it
+moves, so the app keeps writing and reading notifications while a large
+backlog is pruned.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive, PushDelivery
+
+
+def retention_cutoff(days=None, now=None):
+    days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def prunable_notifications(cutoff):
+    # Keyed notifications stay: their dedup_key is what stops them being sent again
+    return Notification.objects.filter(is_read=True, created_at__lt=cutoff, dedup_key__isnull=True)
+
+
+def id_bound(cutoff):
+    """
+    First id created at or after ``cutoff`` (or None if there is none). Ids grow
+    with created_at, so no batch needs to scan past it.
+    """
+    return Notification.objects.filter(created_at__gte=cutoff).order_by('id').values_list('id', flat=True).first()
+
+
+def next_batch(cutoff, after_id, size, bound=None):
+    """Ids of the next ``size`` prunable notifications above ``after_id``, ascending."""
+    queryset = prunable_notifications(cutoff).filter(id__gt=after_id)
+    if bound is not None:
+        queryset = queryset.filter(id__lt=bound)
+    return list(queryset.order_by('id').values_list('id', flat=True)[:size])
+
+
+def prune_batch(ids, archive=True, now=None):
+    """
+    Archive (unless ``archive`` is false) and delete the notifications ``ids``
+    in one transaction. Returns the number of notifications deleted.
+    """
+    now = now or timezone.now()
+    placeholders = ', '.join(['%s'] * len(ids))
+    notification_table = Notification._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        if archive:
+            # Copied inside the database, so message bodies never make a round trip through Python.
+            # A batch retried after a crash between the copy and the delete is already archived.
+            cursor.execute(
+                f'INSERT INTO {NotificationArchive._meta.db_table} '
+                '(id, user_type, recipient_id, title, message, created_at, archived_at) '
+                'SELECT id, user_type, COALESCE(employee_id, employer_id), title, message, created_at, %s '
+                f'FROM {notification_table} WHERE is_read AND dedup_key IS NULL AND id IN ({placeholders}) '
+                'ON CONFLICT (id) DO NOTHING',
+                [now, *ids],
+            )
+        # The push_delivery foreign key only cascades in Django, so clear it first; then both
+        # deletes are a single statement instead of Django loading every row to collect them
+        PushDelivery.objects.filter(notification_id__in=ids).delete()
+        cursor.execute(
+            f'DELETE FROM {notification_table} WHERE is_read AND dedup_key IS NULL AND id IN ({placeholders})', ids
+        )
+        return cursor.rowcount
@@ -0,0 +1,46 @@
+"""
+Full-text search over job posts.
+
+On Postgres every post keeps a weighted ``tsvector`` in ``JobPost.search_vector``
+(GIN indexed), refreshed from the post_save signals in ``apps.signals``.
+
+Search needs Postgres. The SQLite mode (USE_SQLITE=true) cannot migrate the
+ArrayField columns job posts are built on, so there is no SQLite fallback.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Func, OuterRef, Subquery, TextField, Value
+
+from .models import EmployerRegistration
+
+SEARCH_CONFIG = 'english'
+
+# JobPost fields that feed the index; saves touching none of them skip reindexing
+SEARCH_FIELDS = {'job_title', 'job_description', 'required_skills', 'employer'}
+
+
+def search_vector():
+    """Weighted tsvector expression for a job post row: title > skills/company > description."""
+    company_name = Subquery(
+        EmployerRegistration.objects.filter(employer_id=OuterRef('employer_id')).values('company_name')[:1]
+    )
+    skills = Func(F('required_skills'), Value(' '), function='array_to_string', output_field=TextField())
+    return (
+        SearchVector('job_title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(skills, weight='B', config=SEARCH_CONFIG)
+        + SearchVector(company_name, weight='B', config=SEARCH_CONFIG)
+        + SearchVector('job_description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_index(queryset):
+    """Recompute the search index entries for the given job posts."""
+    return queryset.update(search_vector=search_vector())
+
+
+def search_job_posts(queryset, q):
+    """Filter ``queryset`` to posts matching ``q``, annotated with ``rank`` and best first."""
+    query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query),
+    ).order_by('-rank', '-created_at')
+
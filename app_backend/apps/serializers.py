@@ -1,12 +1,66 @@
 from rest_framework import serializers
-from .models import EmployeeRegistration, Profile, EmployerRegistration, ViewedCandidate, CompanyCertificate, EmployerFeedback, JobPost, FavJob, ViewedJob, Notification
+from rest_framework.permissions import SAFE_METHODS
+from .models import EmployeeRegistration, Profile, EmployerRegistration, ViewedCandidate, CompanyCertificate, EmployerFeedback, JobPost, FavJob, ViewedJob, Notification, JobFanout
 
-class ProfileSerializer(serializers.ModelSerializer):
+
+def _split(raw):
+    return {name.strip() for value in raw for name in value.split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets for ModelSerializers.
+
+    On read requests ``?fields=a,b`` keeps only the listed fields and ``?omit=c``
+    drops fields; the same can be passed as ``fields=``/``omit=`` kwargs. Dropped
+    SerializerMethodFields are never evaluated, and ``required_columns()`` tells
+    the view which model columns are still needed so it can prune with ``.only()``.
+
+    Meta options:
+      method_field_sources -- {method field: model fields it reads}
+      always_fetch -- model fields read outside of the declared fields
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if fields is None and omit is None and request is not None and request.method in SAFE_METHODS:
+            params = getattr(request, 'query_params', request.GET)
+            if 'fields' in params:
+                fields = _split(params.getlist('fields'))
+            omit = _split(params.getlist('omit'))
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    def required_columns(self):
+        """Model fields the remaining serializer fields read, or None if that can't be worked out."""
+        model = self.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        method_sources = getattr(self.Meta, 'method_field_sources', {})
+        columns = {model._meta.pk.name, *getattr(self.Meta, 'always_fetch', ())}
+        for name, field in self.fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in method_sources:
+                    return None
+                columns.update(method_sources[name])
+            elif field.source in concrete:
+                columns.add(field.source)
+            else:
+                return None
+        return columns
+
+class ProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     is_registered = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
         fields = ['id', 'phone_number', 'candidate_type', 'created_at', 'updated_at', 'is_registered']
+        method_field_sources = {'is_registered': ('phone_number',)}
 
     def get_is_registered(self, obj):
         return (
@@ -14,7 +68,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             EmployerRegistration.objects.filter(phone_number=obj.phone_number).exists()
         )
 
-class EmployeeRegistrationSerializer(serializers.ModelSerializer):
+class EmployeeRegistrationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EmployeeRegistration
         fields = [
@@ -26,7 +80,7 @@ class EmployeeRegistrationSerializer(serializers.ModelSerializer):
             'latitude', 'longitude', 'address',
         ]
 
-class EmployerRegistrationSerializer(serializers.ModelSerializer):
+class EmployerRegistrationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EmployerRegistration
         fields = [
@@ -39,22 +93,22 @@ class EmployerRegistrationSerializer(serializers.ModelSerializer):
             'latitude', 'longitude', 'address',
         ]
 
-class ViewedCandidateSerializer(serializers.ModelSerializer):
+class ViewedCandidateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ViewedCandidate
         fields = ['id', 'employer', 'employee', 'viewed_at'] 
 
-class CompanyCertificateSerializer(serializers.ModelSerializer):
+class CompanyCertificateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CompanyCertificate
         fields = ['id', 'employer', 'certificate', 'description', 'uploaded_at'] 
 
-class EmployerFeedbackSerializer(serializers.ModelSerializer):
+class EmployerFeedbackSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EmployerFeedback
         fields = '__all__' 
 
-class JobPostSerializer(serializers.ModelSerializer):
+class JobPostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     # Explicitly define ArrayFields to ensure they are handled as lists
     city = serializers.ListField(
         child=serializers.CharField(max_length=50),
@@ -102,17 +156,28 @@ class JobPostSerializer(serializers.ModelSerializer):
             return obj.job_video.url
         return None
 
+    # Employer fields come pre-joined from JobPost.objects.with_employer_fields();
+    # fall back to the relation for instances loaded without the annotation.
     def get_company_name(self, obj):
-        return obj.employer.company_name if obj.employer else None
+        if hasattr(obj, 'company_name'):
+            return obj.company_name
+        return obj.employer.company_name
 
     def get_employer_photo_url(self, obj):
-        return obj.employer.photo_url if obj.employer and obj.employer.photo_url else None
+        if hasattr(obj, 'employer_photo'):
+            name = obj.employer_photo
+            return EmployerRegistration._meta.get_field('photo').storage.url(name) if name else None
+        return obj.employer.photo.url if obj.employer.photo else None
 
     def get_employer_location(self, obj):
-        return obj.employer.location if obj.employer else None
+        if hasattr(obj, 'employer_location'):
+            return obj.employer_location
+        return obj.employer.location
 
     def get_employer_subscription_type(self, obj):
-        return obj.employer.subscription_type if obj.employer else None
+        if hasattr(obj, 'employer_subscription_type'):
+            return obj.employer_subscription_type
+        return obj.employer.subscription_type
 
     class Meta:
         model = JobPost
@@ -125,8 +190,25 @@ class JobPostSerializer(serializers.ModelSerializer):
             'terms_conditions', 'condition', 'employer', 'created_at', 'updated_at',
             'company_name', 'employer_photo_url', 'employer_location',
             'gender', 'marital_status', 'min_age', 'max_age',
-            'employer_subscription_type',
+            'employer_subscription_type', 'expires_at',
         )
+        read_only_fields = ('expires_at',)
+        # Employer values come from with_employer_fields() annotations, which .only() leaves alone
+        method_field_sources = {
+            'job_video_url': ('job_video',),
+            'company_name': ('employer',),
+            'employer_photo_url': ('employer',),
+            'employer_location': ('employer',),
+            'employer_subscription_type': ('employer',),
+        }
+        always_fetch = ('condition', 'expires_at')
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Posts past expires_at read as draft until the expiry engine sweeps them
+        if instance.is_expired():
+            data['condition'] = 'draft'
+        return data
 
     def create(self, validated_data):
         # Extract file from validated_data if present
@@ -170,17 +252,34 @@ class JobPostSerializer(serializers.ModelSerializer):
         instance.save()
         return instance 
 
-class FavJobSerializer(serializers.ModelSerializer):
+class FavJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = FavJob
         fields = '__all__' 
 
-class ViewedJobSerializer(serializers.ModelSerializer):
+class ViewedJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ViewedJob
         fields = ['id', 'job_post', 'employer', 'employee', 'viewed_at', 'applied'] 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = '__all__' 
\ No newline at end of file
+        fields = '__all__' 
+
+class JobFanoutSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = JobFanout
+        fields = [
+            'job', 'status', 'total_recipients', 'notified', 'progress', 'pushes_sent', 'pushes_failed',
+            'pushes_queued', 'attempts', 'next_attempt_at', 'last_error', 'created_at', 'started_at', 'finished_at',
+        ]
+        method_field_sources = {'progress': ('total_recipients', 'notified')}
+
+    def get_progress(self, obj):
+        """Share of recipients notified so far, from 0 to 1; None until the worker has counted them."""
+        if obj.total_recipients is None:
+            return None
+        return round(obj.notified / obj.total_recipients, 4) if obj.total_recipients else 1.0
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .cache import bump_job_feed_version
+from .distance import SNAPSHOTS
+from .models import EmployeeRegistration, EmployerRegistration, JobPost, Notification
+from .search import SEARCH_FIELDS, update_search_index
+from .streaming import publish_notifications
+
+
+@receiver(post_save, sender=JobPost)
+@receiver(post_delete, sender=JobPost)
+@receiver(post_save, sender=EmployerRegistration)
+@receiver(post_delete, sender=EmployerRegistration)
+def invalidate_job_feed_cache(sender, **kwargs):
+    bump_job_feed_version()
+
+
+@receiver(post_save, sender=JobPost)
+def refresh_job_post_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    update_search_index(JobPost.objects.filter(pk=instance.pk))
+
+
+@receiver(post_init, sender=EmployerRegistration)
+def remember_company_name(sender, instance, **kwargs):
+    # Read __dict__ so rows loaded with .only() don't fetch the deferred column
+    instance._indexed_company_name = instance.__dict__.get('company_name')
+
+
+@receiver(post_save, sender=EmployerRegistration)
+def refresh_employer_job_posts_search(sender, instance, created, **kwargs):
+    # Only a company rename changes the indexed text of the employer's posts
+    if created or 'company_name' not in instance.__dict__ or instance.company_name == instance._indexed_company_name:
+        return
+    update_search_index(JobPost.objects.filter(employer=instance))
+    instance._indexed_company_name = instance.company_name
+
+
+@receiver(post_save, sender=EmployeeRegistration)
+@receiver(post_save, sender=EmployerRegistration)
+def refresh_coordinate_snapshot(sender, instance, **kwargs):
+    snapshot = SNAPSHOTS[sender]
+    # Skip unloaded snapshots (the next query loads fresh) and saves of rows loaded without coordinates
+    if not snapshot.loaded or 'latitude' not in instance.__dict__ or 'longitude' not in instance.__dict__:
+        return
+    snapshot.upsert(instance.pk, instance.latitude, instance.longitude)
+
+
+@receiver(post_delete, sender=EmployeeRegistration)
+@receiver(post_delete, sender=EmployerRegistration)
+def drop_from_coordinate_snapshot(sender, instance, **kwargs):
+    snapshot = SNAPSHOTS[sender]
+    if snapshot.loaded:
+        snapshot.remove(instance.pk)
+
+
+@receiver(post_save, sender=Notification)
+def stream_new_notification(sender, instance, created, **kwargs):
+    # bulk_create skips this; run_fanout publishes its chunks itself
+    if created:
+        publish_notifications([instance])
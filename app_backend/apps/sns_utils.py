@@ -1,54 +1,64 @@
-import boto3
 from django.conf import settings
 import os
 import sys
-import firebase_admin
-from firebase_admin import credentials, messaging
+from firebase_admin import messaging
+from .clients import fcm_client, sns_client
 
-# Initialize firebase_admin only once
-if not firebase_admin._apps:
-    cred = credentials.Certificate(os.path.join(os.path.dirname(__file__), '../jobs-7809e-firebase-adminsdk-fbsvc-f7d892249c.json'))
-    firebase_admin.initialize_app(cred)
 
+def publish_sns(subject, message, device_token=None):
+    """Publish to the device endpoint, or to the topic without one. Raises on failure."""
+    client = sns_client()
+    if device_token:
+        # If device_token is provided, publish directly to the device endpoint
+        return client.publish(
+            TargetArn=device_token,
+            Message=message,
+            Subject=subject,
+        )
+    # Fallback to topic notification
+    return client.publish(
+        TopicArn=settings.AWS_SNS_TOPIC_ARN,
+        Message=message,
+        Subject=subject,
+    )
 
 def send_sns_notification(subject, message, device_token=None):
     try:
-        client = boto3.client(
-            "sns",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_SNS_REGION_NAME,
-        )
-        if device_token:
-            # If device_token is provided, publish directly to the device endpoint
-            response = client.publish(
-                TargetArn=device_token,
-                Message=message,
-                Subject=subject,
-            )
-        else:
-            # Fallback to topic notification
-            response = client.publish(
-                TopicArn=settings.AWS_SNS_TOPIC_ARN,
-                Message=message,
-                Subject=subject,
-            )
-        return response
+        return publish_sns(subject, message, device_token)
     except Exception as e:
         print(f"SNS notification error: {e}")
         return None
 
+def send_fcm(title, body, fcm_token):
+    """Send one FCM message and return its message id. Raises on failure."""
+    message = messaging.Message(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        token=fcm_token,
+    )
+    return fcm_client().send(message)
+
+# FCM accepts at most this many messages per send_each call
+FCM_BATCH_LIMIT = 500
+
+def send_fcm_each(notifications):
+    """
+    Send ``[(title, body, fcm_token), ...]`` (at most FCM_BATCH_LIMIT) in one
+    send_each call. Returns ``[(message_id, exception), ...]`` in the same order.
+    """
+    messages = [
+        messaging.Message(notification=messaging.Notification(title=title, body=body), token=fcm_token)
+        for title, body, fcm_token in notifications
+    ]
+    batch = fcm_client().send_each(messages)
+    return [(response.message_id, response.exception) for response in batch.responses]
+
 # Send push notification via Firebase Cloud Messaging (FCM)
 def send_fcm_notification(title, body, fcm_token):
     try:
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            token=fcm_token,
-        )
-        response = messaging.send(message)
+        response = send_fcm(title, body, fcm_token)
         print(f"FCM notification sent: {response}")
         return response
     except Exception as e:
@@ -0,0 +1,309 @@
+"""
+Server-Sent Events stream of new notifications.
+
+core/asgi.py serves GET /api/notifications/stream/?employee_id= (or
+employer_id=) with notification_stream, a raw ASGI handler. Under Django 4.2 a
+streaming view never learns that its client went away, so it could not free its
+slot. Each connection waits on an asyncio.Event in the process-wide Hub; an idle
+connection costs a few kilobytes and no thread or database connection.
+
+Events carry no data. A post_save signal (and run_fanout, for its
+bulk_create) tells the broker which recipients have something new once the
+transaction commits. The broker relays that to the Hub of every ASGI process.
+A woken stream reads notifications with an id above the last one it sent from
+the database, so the database stays the only source of truth:
+- a burst of wake-ups collapses into one query
+- a reconnecting client resumes exactly from its Last-Event-ID
+- after a broker outage every stream is woken once to catch up
+
+settings.NOTIFICATION_BROKER picks the broker. PostgresBroker uses
+LISTEN/NOTIFY, so any process that writes notifications reaches every ASGI
+worker. LocalBroker is the stand-in that only reaches the current process.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.utils.module_loading import import_string
+
+STREAM_PATH = '/api/notifications/stream/'
+BATCH_SIZE = 100
+# pg_notify payloads must stay under 8000 bytes
+MAX_PAYLOAD = 7500
+
+
+def recipient_key(user_type, recipient_id):
+    return f'{user_type}:{recipient_id}'
+
+
+def notification_key(notification):
+    if notification.employee_id:
+        return recipient_key('employee', notification.employee_id)
+    return recipient_key('employer', notification.employer_id)
+
+
+class Hub:
+    """In-process pub/sub: one asyncio.Event per open stream, keyed by recipient."""
+
+    def __init__(self):
+        self.subscribers = defaultdict(set)
+        self.loop = None
+
+    def subscribe(self, key):
+        self.loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        self.subscribers[key].add(event)
+        return event
+
+    def unsubscribe(self, key, event):
+        events = self.subscribers.get(key)
+        if events is not None:
+            events.discard(event)
+            if not events:
+                del self.subscribers[key]
+
+    def publish(self, keys):
+        """Wake the streams of ``keys``; must run on the event loop."""
+        for key in keys:
+            for event in self.subscribers.get(key, ()):
+                event.set()
+
+    def publish_all(self):
+        for events in self.subscribers.values():
+            for event in events:
+                event.set()
+
+    def publish_threadsafe(self, keys):
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.publish, list(keys))
+
+    def connection_count(self):
+        return sum(len(events) for events in self.subscribers.values())
+
+
+hub = Hub()
+
+
+class LocalBroker:
+    """
+    Same-process stand-in for development and tests: wakes only this process'
+    streams, so it covers notifications written inside the ASGI server itself.
+    """
+
+    def publish(self, keys):
+        hub.publish_threadsafe(keys)
+
+    async def listen(self, hub):
+        # Nothing to relay; park so ensure_listening does not start us again
+        await asyncio.get_running_loop().create_future()
+
+
+class PostgresBroker:
+    """Relays wake-ups between processes with Postgres LISTEN/NOTIFY."""
+
+    channel = 'notification_events'
+    reconnect_seconds = 5
+
+    def publish(self, keys):
+        payloads, current = [], ''
+        for key in sorted(set(keys)):
+            if current and len(current) + len(key) + 1 > MAX_PAYLOAD:
+                payloads.append(current)
+                current = ''
+            current = f'{current},{key}' if current else key
+        if current:
+            payloads.append(current)
+        with connection.cursor() as cursor:
+            for payload in payloads:
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    async def listen(self, hub):
+        """Forward notifications to ``hub`` forever, reconnecting if the listening connection drops."""
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        loop = asyncio.get_running_loop()
+        while True:
+            lost = loop.create_future()
+            try:
+                conn = await loop.run_in_executor(
+                    None, lambda: psycopg2.connect(**connections['default'].get_connection_params())
+                )
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+            except psycopg2.Error as e:
+                print(f'Notification broker connect error: {e}')
+                await asyncio.sleep(self.reconnect_seconds)
+                continue
+
+            def readable():
+                try:
+                    conn.poll()
+                except psycopg2.Error as e:
+                    if not lost.done():
+                        lost.set_result(e)
+                    return
+                keys = []
+                while conn.notifies:
+                    keys.extend(conn.notifies.pop(0).payload.split(','))
+                hub.publish(keys)
+
+            loop.add_reader(conn.fileno(), readable)
+            # Wake everyone: whatever was published while we were not listening is picked up from the database
+            hub.publish_all()
+            try:
+                error = await lost
+                print(f'Notification broker connection lost: {error}')
+            finally:
+                loop.remove_reader(conn.fileno())
+                conn.close()
+            await asyncio.sleep(self.reconnect_seconds)
+
+
+_broker = None
+_listener = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.NOTIFICATION_BROKER)()
+    return _broker
+
+
+def _publish(keys):
+    # The notification is already committed; a lost wake-up only delays it to the stream's next query
+    try:
+        get_broker().publish(keys)
+    except Exception as e:
+        print(f'Notification broker publish error: {e}')
+
+
+def publish_notifications(notifications):
+    """Tell connected streams about ``notifications`` once the current transaction commits."""
+    keys = {notification_key(notification) for notification in notifications}
+    if keys:
+        transaction.on_commit(lambda: _publish(keys))
+
+
+def ensure_listening():
+    """Start relaying broker messages to this process' hub, once per event loop."""
+    global _listener
+    loop = asyncio.get_running_loop()
+    if _listener is None or _listener.done() or _listener.get_loop() is not loop:
+        _listener = loop.create_task(get_broker().listen(hub))
+
+
+# Stream queries run here rather than on the single thread-sensitive executor, so many
+# streams waking together query in parallel; its size caps the database connections used
+_db_executor = ThreadPoolExecutor(max_workers=settings.SSE_DB_THREADS, thread_name_prefix='sse-db')
+
+
+def _recipient_filter(params):
+    for user_type in ('employee', 'employer'):
+        value = params.get(f'{user_type}_id', [''])[0]
+        if value.isdigit():
+            return user_type, {f'{user_type}_id': int(value)}
+    return None, None
+
+
+def _latest_id(recipient):
+    from .models import Notification
+
+    # These threads live outside Django's request cycle; drop broken or expired connections ourselves
+    close_old_connections()
+    try:
+        return Notification.objects.filter(**recipient).order_by('-id').values_list('id', flat=True).first() or 0
+    finally:
+        close_old_connections()
+
+
+def _notifications_after(recipient, last_id):
+    from .models import Notification
+    from .serializers import NotificationSerializer
+
+    close_old_connections()
+    try:
+        rows = Notification.objects.filter(**recipient, id__gt=last_id).order_by('id')[:BATCH_SIZE]
+        return [(row['id'], json.dumps(row)) for row in NotificationSerializer(rows, many=True).data]
+    finally:
+        close_old_connections()
+
+
+async def _send_body(send, text):
+    await send({'type': 'http.response.body', 'body': text.encode(), 'more_body': True})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def notification_stream(scope, receive, send):
+    """
+    GET /api/notifications/stream/?employee_id=... (or employer_id=...)
+    Streams text/event-stream events "notification" whose data is the
+    NotificationSerializer JSON and whose id is the notification id.
+
+    A reconnecting EventSource sends Last-Event-ID and receives everything
+    after it; ?last_event_id= does the same for clients that cannot set
+    headers. A fresh stream starts after the newest existing notification.
+    """
+    params = parse_qs(scope['query_string'].decode())
+    user_type, recipient = _recipient_filter(params)
+    if recipient is None or scope['method'] != 'GET':
+        status, body = (405, 'Method not allowed.') if recipient else (400, 'employee_id or employer_id is required.')
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': json.dumps({'error': body}).encode()})
+        return
+
+    ensure_listening()
+    key = recipient_key(user_type, recipient[f'{user_type}_id'])
+    # Subscribe before the first query so nothing committed in between is missed
+    wake = hub.subscribe(key)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        headers = dict(scope['headers'])
+        last_id = (headers.get(b'last-event-id', b'').decode() or params.get('last_event_id', [''])[0]).strip()
+        if last_id.isdigit():
+            last_id = int(last_id)
+        else:
+            last_id = await sync_to_async(_latest_id, thread_sensitive=False, executor=_db_executor)(recipient)
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        await _send_body(send, f'retry: {settings.SSE_RETRY_MS}\n\n')
+        while True:
+            wake.clear()
+            rows = await sync_to_async(_notifications_after, thread_sensitive=False, executor=_db_executor)(recipient, last_id)
+            if rows:
+                await _send_body(send, ''.join(f'id: {id}\nevent: notification\ndata: {data}\n\n' for id, data in rows))
+                last_id = rows[-1][0]
+                if len(rows) == BATCH_SIZE:
+                    continue
+            # Idle until woken; keepalives go out meanwhile without touching the database
+            while not wake.is_set():
+                waiter = asyncio.ensure_future(wake.wait())
+                done, _ = await asyncio.wait(
+                    {waiter, disconnected}, timeout=settings.SSE_HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    waiter.cancel()
+                    return
+                if waiter not in done:
+                    waiter.cancel()
+                    # Comment line: keeps proxies from closing an idle stream
+                    await _send_body(send, ': keepalive\n\n')
+    finally:
+        hub.unsubscribe(key, wake)
+        disconnected.cancel()
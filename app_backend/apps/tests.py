@@ -0,0 +1,144 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .cache import get_cache
+from .models import EmployeeRegistration, EmployerRegistration, JobPost, Notification
+
+
+class JobPostQueryCountTests(APITestCase):
+    """
+    Employer fields come from the with_employer_fields() join, so a page of job
+    posts costs the same number of queries whatever its size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        employers = [
+            EmployerRegistration.objects.create(
+                phone_number=f'90000000{i:02d}', company_name=f'Company {i}', location='Chennai', gst_number='GST',
+                founder_name='Founder', business_category='Retail', year_of_establishment='2000',
+                employee_range='1-10', industry_sector='Retail', disability_hiring='No',
+            )
+            for i in range(5)
+        ]
+        JobPost.objects.bulk_create([
+            JobPost(
+                employer=employers[i % len(employers)], job_title=f'Job {i}', min_salary=1000, max_salary=2000,
+                duration='monthly', address='Chennai', experience='Fresher', education='UG',
+                contact_number_1='9000000000', condition='posted',
+            )
+            for i in range(60)
+        ])
+        cls.employee = EmployeeRegistration.objects.create(
+            phone_number='8000000000', name='Employee', gender='M', age=25, district='Chennai', city='Chennai',
+            marital_status='S', work_category='Fresher', education_level='UG', job_location='Chennai',
+        )
+
+    def setUp(self):
+        # A cached response would be served without touching the database at all
+        get_cache().clear()
+
+    def assertSameQueryCount(self, url, params, expected):
+        for page_size in (1, 50):
+            with self.assertNumQueries(expected):
+                response = self.client.get(url, {**params, 'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            results = response.data['results'] if 'results' in response.data else response.data
+            self.assertEqual(len(results), page_size)
+            self.assertTrue(all(job['company_name'] for job in results))
+
+    def test_job_post_list_query_count_is_constant(self):
+        # Conditional-GET validators, then the page
+        self.assertSameQueryCount(reverse('jobpost-list'), {}, 2)
+
+    def test_job_post_feed_query_count_is_constant(self):
+        # The employee, then the ranked page
+        self.assertSameQueryCount(reverse('jobpost-feed'), {'employee_id': self.employee.pk}, 2)
+
+
+class DetailLookupTests(APITestCase):
+    """Conditional-GET validators must not turn a malformed pk into a 500."""
+
+    def test_non_numeric_job_post_pk_is_not_found(self):
+        response = self.client.get(reverse('jobpost-detail', args=['abc']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_non_numeric_employer_pk_is_not_found(self):
+        response = self.client.get(reverse('employerregistration-detail', args=['abc']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_job_post_is_not_found(self):
+        response = self.client.get(reverse('jobpost-detail', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class NotificationRecipientTests(APITestCase):
+    """A malformed employee_id/employer_id is a 400, not an error inside the ORM."""
+
+    def test_unread_count_rejects_non_numeric_id(self):
+        for param in ('employee_id', 'employer_id'):
+            response = self.client.get(reverse('notification-unread-count'), {param: 'abc'})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.data)
+
+    def test_unread_count_requires_a_recipient(self):
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_mark_read_rejects_non_numeric_id(self):
+        for param in ('employee_id', 'employer_id'):
+            response = self.client.post(reverse('notifications-mark-read'), {param: 'abc', 'up_to_id': 1}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.data)
+
+    def test_mark_read_only_touches_the_recipients_notifications(self):
+        employee = EmployeeRegistration.objects.create(
+            phone_number='8000000001', name='Employee', gender='F', age=30, district='Madurai', city='Madurai',
+            marital_status='M', work_category='Fresher', education_level='12TH', job_location='Madurai',
+        )
+        other = EmployeeRegistration.objects.create(
+            phone_number='8000000002', name='Other', gender='M', age=30, district='Madurai', city='Madurai',
+            marital_status='S', work_category='Fresher', education_level='12TH', job_location='Madurai',
+        )
+        mine = Notification.objects.create(employee=employee, user_type='employee', title='t', message='m')
+        theirs = Notification.objects.create(employee=other, user_type='employee', title='t', message='m')
+        response = self.client.post(
+            reverse('notifications-mark-read'), {'employee_id': employee.pk, 'ids': [mine.pk, theirs.pk]}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': 1, 'unread_count': 0})
+        theirs.refresh_from_db()
+        self.assertFalse(theirs.is_read)
+
+
+class NearbyModeTests(APITestCase):
+    """An explicit k or cursor always selects the paged k-nearest response."""
+
+    origin = {'latitude': 13.08, 'longitude': 80.27}
+
+    def test_zero_k_is_rejected(self):
+        response = self.client.post(reverse('nearby-companies'), {**self.origin, 'k': 0}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_k_returns_a_page(self):
+        response = self.client.post(reverse('nearby-companies'), {**self.origin, 'k': 5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'results', 'next'})
+
+    def test_no_k_returns_a_list(self):
+        response = self.client.post(reverse('nearby-companies'), self.origin, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+
+
+class JobPostBulkRetrieveTests(APITestCase):
+
+    def test_duplicate_ids_are_returned_once_in_request_order(self):
+        response = self.client.get(reverse('jobpost-list'), {'ids': '3,1,3,2,1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['missing'], [3, 1, 2])
+
+    def test_too_many_ids_are_rejected(self):
+        ids = ','.join(str(pk) for pk in range(1, 100001))
+        response = self.client.get(reverse('jobpost-list'), {'ids': ids})
+        self.assertEqual(response.status_code, 400)
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EmployeeRegistrationViewSet, ProfileViewSet, EmployerRegistrationViewSet, CompanyCertificateViewSet, EmployerFeedbackViewSet, JobPostViewSet, FavJobViewSet, EmployeePhotoUploadView, candidate_list, view_candidate_profile, viewed_candidates, mark_job_viewed, viewed_jobs, apply_job, applied_jobs, employer_profile_views, employer_applied_candidates, update_employer_plan, analytics_dashboard, NotificationListView, NotificationMarkReadView, nearby_employees, nearby_companies, reverse_geocode, geocode_address
+from .views import EmployeeRegistrationViewSet, ProfileViewSet, EmployerRegistrationViewSet, CompanyCertificateViewSet, EmployerFeedbackViewSet, JobPostViewSet, FavJobViewSet, EmployeePhotoUploadView, candidate_list, view_candidate_profile, viewed_candidates, mark_job_viewed, viewed_jobs, apply_job, applied_jobs, employer_profile_views, employer_applied_candidates, update_employer_plan, analytics_dashboard, NotificationListView, NotificationMarkReadView, notification_unread_count, notifications_mark_read, nearby_employees, nearby_companies, reverse_geocode, geocode_address, job_feed_cache_stats_view, geocode_cache_stats_view
 
 router = DefaultRouter()
 router.register(r'profiles', ProfileViewSet)
@@ -25,10 +25,14 @@ urlpatterns = [
     path('employer-applied-candidates/', employer_applied_candidates, name='employer-applied-candidates'),
     path('update-employer-plan/', update_employer_plan, name='update-employer-plan'),
     path('analytics-dashboard/', analytics_dashboard, name='analytics-dashboard'),
+    path('job-feed-cache-stats/', job_feed_cache_stats_view, name='job-feed-cache-stats'),
     path('notifications/', NotificationListView.as_view(), name='notification-list'),
+    path('notifications/unread-count/', notification_unread_count, name='notification-unread-count'),
+    path('notifications/mark-read/', notifications_mark_read, name='notifications-mark-read'),
     path('notifications/<int:pk>/mark-read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
     path('nearby-employees/', nearby_employees, name='nearby-employees'),
     path('nearby-companies/', nearby_companies, name='nearby-companies'),
     path('reverse_geocode/', reverse_geocode, name='reverse-geocode'),
     path('geocode_address/', geocode_address, name='geocode-address'),
+    path('geocode-cache-stats/', geocode_cache_stats_view, name='geocode-cache-stats'),
 ] 
\ No newline at end of file
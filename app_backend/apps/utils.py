@@ -1,8 +1,12 @@
 import random
 from django.conf import settings
-from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 import requests
+import threading
+from requests.adapters import HTTPAdapter
+from requests.utils import quote
+from urllib3.util.retry import Retry
+from .geocoding import cached_geocode, normalize_address, reverse_key
 
 def generate_otp():
     """Generate a 6-digit OTP"""
@@ -12,8 +16,8 @@ def send_otp(phone_number, otp):
     """Send OTP via Twilio"""
     try:
         print(phone_number)
-        client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-        message = client.messages.create(
+        from .clients import twilio_client
+        message = twilio_client().messages.create(
             body=f'Your OTP for 15 Jobs login is: {otp}',
             from_=settings.TWILIO_PHONE_NUMBER,
             to='+91'+phone_number
@@ -24,36 +28,72 @@ def send_otp(phone_number, otp):
     except Exception as e:
         return False, str(e)
 
-def mapbox_geocode_address(address, api_key):
+_mapbox_session = None
+_mapbox_session_lock = threading.Lock()
+
+def mapbox_session():
+    """Shared keep-alive session so geocoding calls reuse pooled connections."""
+    global _mapbox_session
+    if _mapbox_session is None:
+        with _mapbox_session_lock:
+            if _mapbox_session is None:
+                session = requests.Session()
+                # Retry refused connections and 429/5xx answers, but not read timeouts: that would multiply the wait
+                retries = Retry(
+                    total=2, read=0, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=('GET',), respect_retry_after_header=False,
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _mapbox_session = session
+    return _mapbox_session
+
+def mapbox_places(query, api_key):
     """
-    Use Mapbox Geocoding API to geocode an address to [longitude, latitude].
+    Look up ``query`` (an address or "lon,lat") with the Mapbox Geocoding API.
+    Returns the first feature, or None if nothing matched; raises on HTTP errors.
     """
-    url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{address}.json"
+    url = f"{settings.MAPBOX_GEOCODING_URL}/{quote(query, safe=',')}.json"
     params = {
         "access_token": api_key,
         "limit": 1
     }
-    response = requests.get(url, params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if data.get('features'):
-            coords = data['features'][0]['center']  # [longitude, latitude]
-            return coords
-    return None
+    response = mapbox_session().get(url, params=params, timeout=settings.MAPBOX_TIMEOUT)
+    response.raise_for_status()
+    features = response.json().get('features')
+    return features[0] if features else None
+
+def mapbox_geocode_address(address, api_key):
+    """
+    Use Mapbox Geocoding API to geocode an address to [longitude, latitude].
+    Results are cached, see apps/geocoding.py.
+    """
+    address = normalize_address(address)
+
+    def fetch():
+        feature = mapbox_places(address, api_key)
+        return feature['center'] if feature else None  # [longitude, latitude]
+
+    try:
+        return cached_geocode('forward', address, fetch)
+    except requests.RequestException as e:
+        print(f"Mapbox geocoding failed for {address!r}: {e}")
+        return None
 
 def mapbox_reverse_geocode(lat, lon, api_key):
     """
     Use Mapbox Geocoding API to reverse geocode [lat, lon] to address.
+    Results are cached, see apps/geocoding.py.
     """
-    url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{lon},{lat}.json"
-    params = {
-        "access_token": api_key,
-        "limit": 1
-    }
-    response = requests.get(url, params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if data.get('features'):
-            address = data['features'][0]['place_name']
-            return address
-    return None 
\ No newline at end of file
+    key, lat, lon = reverse_key(lat, lon)
+
+    def fetch():
+        feature = mapbox_places(f"{lon},{lat}", api_key)
+        return feature['place_name'] if feature else None
+
+    try:
+        return cached_geocode('reverse', key, fetch)
+    except requests.RequestException as e:
+        print(f"Mapbox reverse geocoding failed for {key}: {e}")
+        return None
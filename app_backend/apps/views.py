@@ -1,11 +1,18 @@
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action, api_view
 from django.utils import timezone
-from .models import EmployeeRegistration, Profile, EmployerRegistration, ViewedCandidate, CompanyCertificate, EmployerFeedback, JobPost, FavJob, ViewedJob, Notification
+from .models import EmployeeRegistration, Profile, EmployerRegistration, ViewedCandidate, CompanyCertificate, EmployerFeedback, JobPost, FavJob, ViewedJob, Notification, JobFanout
 from .serializers import EmployeeRegistrationSerializer, ProfileSerializer, EmployerRegistrationSerializer, CompanyCertificateSerializer, EmployerFeedbackSerializer, JobPostSerializer, FavJobSerializer, ViewedJobSerializer
 from .utils import generate_otp, send_otp
+from .expiry import reschedule_job_posts
+from .search import search_job_posts
+from .cache import cached_job_feed_response, job_feed_cache_stats
+from .geocoding import geocode_cache_stats
+from .conditional import conditional_response, object_validators, queryset_validators
+from .pagination import CreatedAtCursorPagination, UploadedAtCursorPagination, ViewedAtCursorPagination
 import os
 from django.conf import settings
 from django.core.files.storage import default_storage
@@ -13,19 +20,31 @@ from django.core.files.base import ContentFile
 from rest_framework.parsers import MultiPartParser, FormParser
 import json
 from rest_framework.permissions import AllowAny
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from rest_framework.views import APIView
-from django.db.models import Count
+from django.db.models import Count, Max, Q
 from rest_framework import generics, permissions
-from .serializers import NotificationSerializer
-from .sns_utils import send_sns_notification
-from .sns_utils import send_fcm_notification
-import boto3
-from math import radians, cos, sin, asin, sqrt
+from .serializers import NotificationSerializer, JobFanoutSerializer
+from .outbox import notify
+from .distance import employee_coordinates, employer_coordinates, nearest
+from .geo import distance_km, within_bounding_box
+from functools import partial
+import base64
 
 # Create your views here.
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class SparseFieldsetMixin:
+    """Defer model columns the (possibly ?fields=/?omit= trimmed) serializer doesn't read."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in permissions.SAFE_METHODS:
+            columns = self.get_serializer().required_columns()
+            if columns is not None:
+                queryset = queryset.only(*columns)
+        return queryset
+
+class ProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
 
@@ -61,7 +80,7 @@ class ProfileViewSet(viewsets.ModelViewSet):
             print(f"DEBUG BACKEND: No profile found for phone: {phone_number}")
             return Response({'detail': 'Not found.'}, status=404)
 
-class EmployeeRegistrationViewSet(viewsets.ModelViewSet):
+class EmployeeRegistrationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = EmployeeRegistration.objects.all()
     serializer_class = EmployeeRegistrationSerializer
 
@@ -124,13 +143,8 @@ class EmployeeRegistrationViewSet(viewsets.ModelViewSet):
             # Save raw FCM token
             employee.fcm_token = device_token
             # Register FCM token with SNS and save EndpointArn
-            client = boto3.client(
-                "sns",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_SNS_REGION_NAME,
-            )
-            response = client.create_platform_endpoint(
+            from .clients import sns_client
+            response = sns_client().create_platform_endpoint(
                 PlatformApplicationArn=settings.AWS_SNS_PLATFORM_APPLICATION_ARN_EMPLOYEE,
                 Token=device_token,
             )
@@ -146,7 +160,7 @@ class EmployeeRegistrationViewSet(viewsets.ModelViewSet):
             print("DEBUG: Exception occurred:", e)
             return Response({'detail': str(e)}, status=500)
 
-class EmployerRegistrationViewSet(viewsets.ModelViewSet):
+class EmployerRegistrationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = EmployerRegistration.objects.all()
     serializer_class = EmployerRegistrationSerializer
 
@@ -155,10 +169,14 @@ class EmployerRegistrationViewSet(viewsets.ModelViewSet):
         if phone_number:
             print(f"DEBUG BACKEND: Checking employer registration for phone: {phone_number}")
             queryset = self.queryset.filter(phone_number=phone_number)
-            print(f"DEBUG BACKEND: grade for {phone_number}: {[e.grade for e in queryset]}")
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
-        return super().list(request, *args, **kwargs)
+            validators = queryset_validators(queryset, ('updated_at',))
+            return conditional_response(request, validators, lambda: Response(self.get_serializer(queryset, many=True).data))
+        validators = queryset_validators(self.get_queryset(), ('updated_at',))
+        return conditional_response(request, validators, partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = object_validators(self, ('updated_at',))
+        return conditional_response(request, validators, partial(super().retrieve, request, *args, **kwargs))
 
     def create(self, request, *args, **kwargs):
         print("DEBUG: request.FILES =", request.FILES)
@@ -227,13 +245,8 @@ class EmployerRegistrationViewSet(viewsets.ModelViewSet):
             # Save raw FCM token
             employer.fcm_token = device_token
             # Register FCM token with SNS and save EndpointArn
-            client = boto3.client(
-                "sns",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_SNS_REGION_NAME,
-            )
-            response = client.create_platform_endpoint(
+            from .clients import sns_client
+            response = sns_client().create_platform_endpoint(
                 PlatformApplicationArn=settings.AWS_SNS_PLATFORM_APPLICATION_ARN_EMPLOYER,
                 Token=device_token,
             )
@@ -310,34 +323,22 @@ def view_candidate_profile(request):
         # ENFORCE view_credits
         if employer.view_credits <= 0:
             return Response({'error': 'No view credits left. Please upgrade your plan.'}, status=403)
-        viewed, created = ViewedCandidate.objects.get_or_create(
-            employer=employer, employee=employee
-        )
-        if created:
-            employer.view_credits -= 1
-            employer.save()
-        # Notification trigger: Notify employee
-        try:
-            Notification.objects.create(
-                employee=employee,
-                user_type='employee',
-                title='Profile Viewed',
-                message=f'{employer.company_name} viewed your profile.'
+        with transaction.atomic():
+            viewed, created = ViewedCandidate.objects.get_or_create(
+                employer=employer, employee=employee
             )
-            # Try FCM push if employee has a raw FCM token (not SNS endpoint)
-            if hasattr(employee, 'fcm_token') and employee.fcm_token:
-                send_fcm_notification(
+            if created:
+                employer.view_credits -= 1
+                employer.save()
+            # Notification trigger: Notify employee (the push is sent by run_push_worker)
+            try:
+                notify(
                     title='Profile Viewed',
-                    body=f'{employer.company_name} viewed your profile.',
-                    fcm_token=employee.fcm_token
-                )
-            else:
-                send_sns_notification(
-                    subject='Profile Viewed',
-                    message=f'{employer.company_name} viewed your profile.'
+                    message=f'{employer.company_name} viewed your profile.',
+                    employee=employee,
                 )
-        except Exception as e:
-            print(f'Notification error (view_candidate_profile): {e}')
+            except Exception as e:
+                print(f'Notification error (view_candidate_profile): {e}')
         serializer = EmployeeRegistrationSerializer(employee)
         return Response(serializer.data)
     except EmployeeRegistration.DoesNotExist:
@@ -347,9 +348,10 @@ def view_candidate_profile(request):
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
-class CompanyCertificateViewSet(viewsets.ModelViewSet):
+class CompanyCertificateViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = CompanyCertificate.objects.all().order_by('-uploaded_at')
     serializer_class = CompanyCertificateSerializer
+    pagination_class = UploadedAtCursorPagination
     parser_classes = (MultiPartParser, FormParser)
 
     def get_queryset(self):
@@ -378,7 +380,7 @@ class CompanyCertificateViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class EmployerFeedbackViewSet(viewsets.ModelViewSet):
+class EmployerFeedbackViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = EmployerFeedback.objects.all().order_by('-created_at')
     serializer_class = EmployerFeedbackSerializer
     parser_classes = (MultiPartParser, FormParser)
@@ -393,38 +395,186 @@ class EmployerFeedbackViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class JobPostViewSet(viewsets.ModelViewSet):
+class JobPostViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = JobPost.objects.all().order_by('-created_at')
     serializer_class = JobPostSerializer
     parser_classes = (MultiPartParser, FormParser)
+    # Comma-separated ArrayField filters, all GIN indexed: query param -> (field, lookup).
+    # 'overlap' (&&) matches posts listing any of the values, 'contains' (@>) posts listing all of them.
+    array_filters = {
+        'district': ('district', 'overlap'),
+        'city': ('city', 'overlap'),
+        'skills': ('required_skills', 'contains'),
+        'benefits': ('special_benefits', 'contains'),
+        'physically_challenged': ('physically_challenged', 'overlap'),
+    }
+    max_bulk_ids = 200
 
     def get_queryset(self):
-        queryset = JobPost.objects.all().order_by('-created_at')
-        # Auto-deactivate expired posts
-        for job in queryset.filter(condition='posted'):
-            plan = job.employer.subscription_type
-            created = job.created_at
-            now = timezone.now()
-            expired = False
-            if plan == 'silver' and (now - created).days >= 5:
-                expired = True
-            elif plan == 'gold' and (now - created).days >= 30:
-                expired = True
-            if expired:
-                job.condition = 'draft'
-                job.save()
-        # Filter by condition (posted/draft)
+        queryset = JobPost.objects.with_employer_fields().order_by('-created_at')
+        # Filter by condition (posted/draft). Posts past expires_at count as draft
+        # until the expire_job_posts command sweeps them, so reads never write.
         condition = self.request.query_params.get('condition')
-        if condition:
+        if condition == 'posted':
+            queryset = queryset.live()
+        elif condition == 'draft':
+            queryset = queryset.filter(
+                Q(condition='draft') | Q(condition='posted', expires_at__lte=timezone.now())
+            )
+        elif condition:
             queryset = queryset.filter(condition=condition)
         
         # Filter by employer
         employer_id = self.request.query_params.get('employer_id')
         if employer_id:
             queryset = queryset.filter(employer_id=employer_id)
+
+        # Batch lookup, see bulk_retrieve
+        if 'ids' in self.request.query_params:
+            queryset = queryset.filter(pk__in=self.requested_ids())
+
+        for param, (field, lookup) in self.array_filters.items():
+            values = [
+                value.strip()
+                for raw in self.request.query_params.getlist(param)
+                for value in raw.split(',')
+                if value.strip()
+            ]
+            if values:
+                queryset = queryset.filter(**{f'{field}__{lookup}': values})
         
         return queryset
 
+    # Employer fields are part of every job post payload, so employer edits change the validators too
+    validator_fields = ('updated_at', 'employer__updated_at')
+
+    def list(self, request, *args, **kwargs):
+        validators = queryset_validators(self.get_queryset(), self.validator_fields)
+        if 'ids' in request.query_params:
+            handler = partial(self.bulk_retrieve, request)
+        else:
+            handler = partial(super().list, request, *args, **kwargs)
+        build = partial(cached_job_feed_response, request, handler)
+        return conditional_response(request, validators, build)
+
+    def requested_ids(self):
+        """Parse ?ids=1,2,3 into a de-duplicated list, keeping the request order."""
+        ids, seen = [], set()
+        for raw in self.request.query_params.getlist('ids'):
+            for value in raw.split(','):
+                value = value.strip()
+                if not value:
+                    continue
+                if not value.isdigit():
+                    raise ValidationError({'error': f'Invalid id: {value}'})
+                pk = int(value)
+                if pk in seen:
+                    continue
+                seen.add(pk)
+                ids.append(pk)
+                # Stop at the cap rather than parsing the rest of an oversized list
+                if len(ids) > self.max_bulk_ids:
+                    raise ValidationError({'error': f'At most {self.max_bulk_ids} ids per request.'})
+        return ids
+
+    def bulk_retrieve(self, request):
+        """
+        GET /api/job-posts/?ids=1,2,3
+        Returns the posts in request order, with ids that don't exist (or are
+        excluded by the other filters) listed under 'missing'.
+        """
+        ids = self.requested_ids()
+        jobs = {job.pk: job for job in self.filter_queryset(self.get_queryset())}
+        found = [jobs[pk] for pk in ids if pk in jobs]
+        return Response({
+            'results': self.get_serializer(found, many=True).data,
+            'missing': [pk for pk in ids if pk not in jobs],
+        })
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = object_validators(self, self.validator_fields)
+        build = partial(cached_job_feed_response, request, partial(super().retrieve, request, *args, **kwargs))
+        return conditional_response(request, validators, build)
+
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """
+        One ranked page of live jobs matched to an employee's profile in SQL.
+        Query params: employee_id (required), page_size (optional)
+        """
+        employee_id = request.query_params.get('employee_id')
+        if not employee_id:
+            return Response({'error': 'employee_id is required'}, status=400)
+        try:
+            employee = EmployeeRegistration.objects.get(employee_id=employee_id)
+        except (EmployeeRegistration.DoesNotExist, ValueError):
+            return Response({'error': 'Employee not found'}, status=404)
+        limit = CreatedAtCursorPagination().get_page_size(request)
+        jobs = list(self.filter_queryset(JobPost.objects.with_employer_fields().matching(employee))[:limit])
+        result = self.get_serializer(jobs, many=True).data
+        for job, data in zip(jobs, result):
+            data['match_score'] = job.match_score
+        return Response(result)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Ranked full-text search over title, description, skills and company name.
+        Query params: q (required), page_size (optional); condition/employer_id filters
+        apply as on the list endpoint, and only live posts are searched by default.
+        """
+        q = request.query_params.get('q', '').strip()
+        if not q:
+            return Response({'error': 'q is required'}, status=400)
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'condition' not in request.query_params:
+            queryset = queryset.live()
+        limit = CreatedAtCursorPagination().get_page_size(request)
+        jobs = list(search_job_posts(queryset, q)[:limit])
+        result = self.get_serializer(jobs, many=True).data
+        for job, data in zip(jobs, result):
+            data['rank'] = job.rank
+        return Response(result)
+
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """
+        Jobs ranked by the distance (km) from (lat, lon) to the posting employer.
+        Query params: lat, lon (required), radius (default 10), page_size (optional);
+        the list filters apply as on the list endpoint, and only live posts are
+        returned by default.
+        """
+        try:
+            lat = float(request.query_params['lat'])
+            lon = float(request.query_params['lon'])
+            radius = float(request.query_params.get('radius', 10))
+        except KeyError:
+            return Response({'error': 'lat and lon are required'}, status=400)
+        except ValueError:
+            return Response({'error': 'lat, lon and radius must be numbers'}, status=400)
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'condition' not in request.query_params:
+            queryset = queryset.live()
+        # Bounding box over the indexed employer coordinates first, exact distance second
+        queryset = within_bounding_box(queryset, lat, lon, radius, prefix='employer__')
+        queryset = queryset.annotate(distance_km=distance_km(lat, lon, prefix='employer__'))
+        queryset = queryset.filter(distance_km__lte=radius).order_by('distance_km', '-created_at', '-id')
+        limit = CreatedAtCursorPagination().get_page_size(request)
+        jobs = list(queryset[:limit])
+        result = self.get_serializer(jobs, many=True).data
+        for job, data in zip(jobs, result):
+            data['distance_km'] = job.distance_km
+        return Response(result)
+
+    @action(detail=True, methods=['get'])
+    def fanout(self, request, pk=None):
+        """Progress of the "New Job Match" notifications sent for this job post."""
+        try:
+            fanout = JobFanout.objects.get(job_id=pk)
+        except (JobFanout.DoesNotExist, ValueError):
+            return Response({'error': 'No notification fan-out for this job post'}, status=404)
+        return Response(JobFanoutSerializer(fanout, context={'request': request}).data)
+
     def create(self, request, *args, **kwargs):
         # Define array_fields at the beginning of the method
         array_fields = ['city', 'district', 'required_skills', 'physically_challenged', 'special_benefits']
@@ -481,49 +631,26 @@ class JobPostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=processed_data)
         if serializer.is_valid():
             print("DEBUG: Serializer validated_data:", serializer.validated_data)
-            self.perform_create(serializer)
-            # Decrement no_of_post if post was created
-            if response.status_code == 201 and employer_id:
-                try:
-                    employer = EmployerRegistration.objects.get(employer_id=employer_id)
-                    if employer.no_of_post > 0:
-                        employer.no_of_post -= 1
-                        employer.save()
-                except EmployerRegistration.DoesNotExist:
-                    pass
-            # Notification trigger: Notify suitable employees
-            try:
-                job_post = self.get_object()
-                employer = job_post.employer
-                # Example: notify employees with matching work_category
-                suitable_employees = EmployeeRegistration.objects.filter(work_category=job_post.experience)
-                for employee in suitable_employees:
-                    Notification.objects.create(
-                        employee=employee,
-                        user_type='employee',
-                        title='New Job Match',
-                        message=f'New job posted: {job_post.job_title} matches your profile!'
-                    )
-                    # Try FCM push if employee has a raw FCM token (not SNS endpoint)
-                    if hasattr(employee, 'fcm_token') and employee.fcm_token:
-                        send_fcm_notification(
-                            title='New Job Match',
-                            body=f'New job posted: {job_post.job_title} matches your profile!',
-                            fcm_token=employee.fcm_token
-                        )
-                    else:
-                        send_sns_notification(
-                            subject='New Job Match',
-                            message=f'New job posted: {job_post.job_title} matches your profile!',
-                            device_token=employee.device_token if employee.device_token else None
-                        )
-            except Exception as e:
-                print(f'Notification error (JobPostViewSet.create): {e}')
+            with transaction.atomic():
+                self.perform_create(serializer)
+                job_post = serializer.instance
+                # Decrement no_of_post now that the post was created
+                if employer_id:
+                    try:
+                        employer = EmployerRegistration.objects.get(employer_id=employer_id)
+                        if employer.no_of_post > 0:
+                            employer.no_of_post -= 1
+                            employer.save()
+                    except EmployerRegistration.DoesNotExist:
+                        pass
+                # Notification trigger: queue the "New Job Match" fan-out to suitable employees;
+                # run_push_worker does the work, GET job-posts/<id>/fanout/ reports progress
+                JobFanout.objects.create(job=job_post)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         print("DEBUG: Serializer errors:", serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = JobPost.objects.all().order_by('-created_at')
     serializer_class = JobPostSerializer
     parser_classes = (MultiPartParser, FormParser)
@@ -535,7 +662,7 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class FavJobViewSet(viewsets.ModelViewSet):
+class FavJobViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = FavJob.objects.all().order_by('-created_at')
     serializer_class = FavJobSerializer
     permission_classes = [AllowAny]  # Replace with IsAuthenticated if you add auth
@@ -636,34 +763,21 @@ def apply_job(request):
             employer_id=employer_id,
             employee_id=employee_id
         )
-        viewed_job.applied = True
-        viewed_job.save()
-        # Notification trigger: Notify employer
-        try:
-            employer = EmployerRegistration.objects.get(employer_id=employer_id)
-            employee = EmployeeRegistration.objects.get(employee_id=employee_id)
-            job = JobPost.objects.get(id=job_post_id)
-            Notification.objects.create(
-                employer=employer,
-                user_type='employer',
-                title='New Job Application',
-                message=f'{employee.name} applied for your job: {job.job_title}'
-            )
-            # Try FCM push if employer has a raw FCM token (not SNS endpoint)
-            if hasattr(employer, 'fcm_token') and employer.fcm_token:
-                send_fcm_notification(
+        with transaction.atomic():
+            viewed_job.applied = True
+            viewed_job.save()
+            # Notification trigger: Notify employer (the push is sent by run_push_worker)
+            try:
+                employer = EmployerRegistration.objects.get(employer_id=employer_id)
+                employee = EmployeeRegistration.objects.get(employee_id=employee_id)
+                job = JobPost.objects.get(id=job_post_id)
+                notify(
                     title='New Job Application',
-                    body=f'{employee.name} applied for your job: {job.job_title}',
-                    fcm_token=employer.fcm_token
-                )
-            else:
-                send_sns_notification(
-                    subject='New Job Application',
                     message=f'{employee.name} applied for your job: {job.job_title}',
-                    device_token=employer.device_token if employer.device_token else None
+                    employer=employer,
                 )
-        except Exception as e:
-            print(f'Notification error (apply_job): {e}')
+            except Exception as e:
+                print(f'Notification error (apply_job): {e}')
         serializer = ViewedJobSerializer(viewed_job)
         return Response(serializer.data, status=201 if created else 200)
     except Exception as e:
@@ -692,10 +806,14 @@ def applied_jobs(request):
         # Get all viewed jobs with applied=True for this employee
         viewed = ViewedJob.objects.filter(employee_id=employee_id, applied=True)
         # Get the related job posts
-        job_posts = JobPost.objects.filter(id__in=viewed.values_list('job_post_id', flat=True))
+        job_posts = JobPost.objects.with_employer_fields().filter(id__in=viewed.values_list('job_post_id', flat=True)).order_by('-created_at')
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(job_posts, request)
         # Serialize job posts
         from .serializers import JobPostSerializer
-        serializer = JobPostSerializer(job_posts, many=True, context={'request': request})
+        serializer = JobPostSerializer(page if page is not None else job_posts, many=True, context={'request': request})
+        if page is not None:
+            return paginator.get_paginated_response(serializer.data)
         return Response(serializer.data, status=200)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
@@ -707,9 +825,11 @@ def employer_applied_candidates(request):
         return Response({'error': 'employer_id is required.'}, status=400)
     try:
         # Get all viewed jobs with applied=True for this employer
-        viewed = ViewedJob.objects.filter(employer_id=employer_id, applied=True).select_related('employee', 'job_post')
+        viewed = ViewedJob.objects.filter(employer_id=employer_id, applied=True).select_related('employee', 'job_post').order_by('-viewed_at')
+        paginator = ViewedAtCursorPagination()
+        page = paginator.paginate_queryset(viewed, request)
         result = []
-        for v in viewed:
+        for v in (page if page is not None else viewed):
             employee_data = EmployeeRegistrationSerializer(v.employee).data
             job_title = v.job_post.job_title if v.job_post else ''
             job_post_id = v.job_post.id if v.job_post else None
@@ -718,6 +838,8 @@ def employer_applied_candidates(request):
                 'job_title': job_title,
                 'job_post_id': job_post_id
             })
+        if page is not None:
+            return paginator.get_paginated_response(result)
         return Response(result, status=200)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
@@ -753,6 +875,7 @@ def update_employer_plan(request):
     else:
         return Response({'error': 'Invalid plan'}, status=400)
     employer.save()
+    reschedule_job_posts(employer)
     serializer = EmployerRegistrationSerializer(employer)
     return Response(serializer.data)
 
@@ -785,18 +908,96 @@ def analytics_dashboard(request):
     )
     return Response(data)
 
-class NotificationListView(generics.ListAPIView):
+@api_view(['GET'])
+def job_feed_cache_stats_view(request):
+    """Hit/miss counters for the job feed response cache, for sizing it."""
+    return Response(job_feed_cache_stats())
+
+@api_view(['GET'])
+def geocode_cache_stats_view(request):
+    """Hit/miss counters for the geocoding cache of the worker serving the request."""
+    return Response(geocode_cache_stats())
+
+def recipient_notifications(params):
+    """
+    Notifications of the employee_id or employer_id in ``params``, or None if
+    neither is given. A non-numeric id raises a 400 ValidationError.
+    """
+    for field in ('employee_id', 'employer_id'):
+        value = params.get(field)
+        if value in (None, ''):
+            continue
+        if not str(value).isdigit():
+            raise ValidationError({'error': f'{field} must be a number.'})
+        return Notification.objects.filter(**{field: int(value)})
+    return None
+
+class NotificationListView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.AllowAny]  # Change to IsAuthenticated if you use authentication
 
     def get_queryset(self):
-        employee_id = self.request.query_params.get('employee_id')
-        employer_id = self.request.query_params.get('employer_id')
-        if employee_id:
-            return Notification.objects.filter(employee_id=employee_id)
-        elif employer_id:
-            return Notification.objects.filter(employer_id=employer_id)
-        return Notification.objects.none()
+        queryset = recipient_notifications(self.request.query_params)
+        if queryset is None:
+            return Notification.objects.none()
+        if self.request.query_params.get('unread', '').lower() in ('true', '1'):
+            queryset = queryset.filter(is_read=False)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Notifications have no updated_at; marking one read only shows up in the unread count
+        validators = queryset_validators(
+            self.get_queryset(),
+            latest_id=Max('id'),
+            unread=Count('id', filter=Q(is_read=False)),
+        )
+        return conditional_response(request, validators, partial(super().list, request, *args, **kwargs))
+
+@api_view(['GET'])
+def notification_unread_count(request):
+    """
+    Badge count for ?employee_id= or ?employer_id=. Served from the partial
+    "unread" index alone, so polling it costs a handful of index pages.
+    """
+    queryset = recipient_notifications(request.query_params)
+    if queryset is None:
+        return Response({'error': 'employee_id or employer_id is required.'}, status=400)
+    return Response({'unread_count': queryset.filter(is_read=False).count()})
+
+MARK_READ_MAX_IDS = 1000
+
+@api_view(['POST'])
+def notifications_mark_read(request):
+    """
+    POST /api/notifications/mark-read/
+    Accepts JSON: {"employee_id": ... or "employer_id": ..., and "ids": [...] or "up_to_id": ...}
+    Returns: {"updated": ..., "unread_count": ...}
+
+    Marks the listed notifications, or every one up to and including up_to_id,
+    read in one UPDATE. Ids that belong to someone else or are already read are
+    left alone and not counted.
+    """
+    queryset = recipient_notifications(request.data)
+    if queryset is None:
+        return Response({'error': 'employee_id or employer_id is required.'}, status=400)
+    ids = request.data.get('ids')
+    up_to_id = request.data.get('up_to_id')
+    if (ids is None) == (up_to_id is None):
+        return Response({'error': 'Send either ids or up_to_id.'}, status=400)
+    if ids is not None:
+        if isinstance(ids, str):
+            ids = [value.strip() for value in ids.split(',') if value.strip()]
+        if not isinstance(ids, list) or not all(str(value).isdigit() for value in ids):
+            return Response({'error': 'ids must be a list of notification ids.'}, status=400)
+        if len(ids) > MARK_READ_MAX_IDS:
+            return Response({'error': f'At most {MARK_READ_MAX_IDS} ids per request.'}, status=400)
+        target = queryset.filter(pk__in={int(value) for value in ids})
+    else:
+        if not str(up_to_id).isdigit():
+            return Response({'error': 'up_to_id must be a notification id.'}, status=400)
+        target = queryset.filter(pk__lte=int(up_to_id))
+    updated = target.filter(is_read=False).update(is_read=True)
+    return Response({'updated': updated, 'unread_count': queryset.filter(is_read=False).count()})
 
 class NotificationMarkReadView(generics.UpdateAPIView):
     serializer_class = NotificationSerializer
@@ -818,8 +1019,8 @@ def geocode_address(request):
     address = request.data.get('address')
     if not address:
         return Response({'error': 'Address is required.'}, status=400)
-    from .utils import mapbox_geocode_address
-    coords = mapbox_geocode_address(address, settings.MAPBOX_API_KEY)
+    from .geocoding import forward_geocode
+    coords = forward_geocode(address)
     if coords:
         return Response({'longitude': coords[0], 'latitude': coords[1]})
     else:
@@ -835,68 +1036,73 @@ def reverse_geocode(request):
     lon = request.data.get('longitude')
     if lat is None or lon is None:
         return Response({'error': 'latitude and longitude are required.'}, status=400)
-    from .utils import mapbox_reverse_geocode
-    address = mapbox_reverse_geocode(lat, lon, settings.MAPBOX_API_KEY)
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return Response({'error': 'latitude and longitude must be numbers.'}, status=400)
+    from .geocoding import reverse_geocode as reverse_geocode_lookup
+    address = reverse_geocode_lookup(lat, lon)
     if address:
         return Response({'address': address})
     else:
         return Response({'error': 'No results found.'}, status=404)
 
-def haversine(lon1, lat1, lon2, lat2):
-    """Calculate the great circle distance in kilometers between two points on the earth."""
-    # convert decimal degrees to radians
-    lon1, lat1, lon2, lat2 = map(float, [lon1, lat1, lon2, lat2])
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-    # haversine formula
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    r = 6371  # Radius of earth in kilometers
-    return c * r
+NEARBY_MAX_K = 200
 
-@api_view(['POST'])
-def nearby_employees(request):
+
+def _nearby_response(request, snapshot, serializer_class):
     """
-    Accepts JSON: {"latitude": ..., "longitude": ..., "radius": ...}
-    Returns: List of employees within radius (km)
+    Without ``k``/``limit`` every match within ``radius`` (default 10km) is returned
+    as a list. With them only the k nearest are returned, ``radius`` becomes an
+    optional cut-off and ``next`` carries the cursor for the following page.
     """
     lat = request.data.get('latitude')
     lon = request.data.get('longitude')
-    radius = float(request.data.get('radius', 10))  # default 10km
     if lat is None or lon is None:
         return Response({'error': 'latitude and longitude are required.'}, status=400)
-    employees = EmployeeRegistration.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    k = request.data.get('k', request.data.get('limit', request.query_params.get('k', request.query_params.get('limit'))))
+    cursor = request.data.get('cursor', request.query_params.get('cursor'))
+    radius = request.data.get('radius')
+    # Presence, not truthiness, picks the mode, so an explicit k of 0 is validated rather than ignored
+    paged = k is not None or cursor is not None
+    try:
+        lat, lon = float(lat), float(lon)
+        radius = float(radius) if radius is not None else (None if paged else 10)  # default 10km
+    except (TypeError, ValueError):
+        return Response({'error': 'latitude, longitude and radius must be numbers.'}, status=400)
+    if not paged:
+        matches = nearest(snapshot, lat, lon, radius)
+    else:
+        try:
+            k = min(NEARBY_MAX_K if k is None else int(k), NEARBY_MAX_K)
+            offset = int(base64.urlsafe_b64decode(cursor).decode()) if cursor else 0
+        except (TypeError, ValueError):
+            return Response({'error': 'Invalid k or cursor.'}, status=400)
+        if k < 1 or offset < 0:
+            return Response({'error': 'Invalid k or cursor.'}, status=400)
+        matches = nearest(snapshot, lat, lon, radius, k=k, offset=offset)
     result = []
-    for emp in employees:
-        if emp.latitude is not None and emp.longitude is not None:
-            dist = haversine(lon, lat, emp.longitude, emp.latitude)
-            if dist <= radius:
-                data = EmployeeRegistrationSerializer(emp).data
-                data['distance_km'] = dist
-                result.append(data)
-    result.sort(key=lambda x: x['distance_km'])
-    return Response(result)
+    for dist, obj in matches:
+        data = serializer_class(obj).data
+        data['distance_km'] = dist
+        result.append(data)
+    if not paged:
+        return Response(result)
+    next_cursor = base64.urlsafe_b64encode(str(offset + k).encode()).decode() if len(result) == k else None
+    return Response({'results': result, 'next': next_cursor})
+
+@api_view(['POST'])
+def nearby_employees(request):
+    """
+    Accepts JSON: {"latitude": ..., "longitude": ..., "radius": ..., "k": ..., "cursor": ...}
+    Returns: List of employees within radius (km), or a page of the k nearest
+    """
+    return _nearby_response(request, employee_coordinates, EmployeeRegistrationSerializer)
 
 @api_view(['POST'])
 def nearby_companies(request):
     """
-    Accepts JSON: {"latitude": ..., "longitude": ..., "radius": ...}
-    Returns: List of companies within radius (km)
+    Accepts JSON: {"latitude": ..., "longitude": ..., "radius": ..., "k": ..., "cursor": ...}
+    Returns: List of companies within radius (km), or a page of the k nearest
     """
-    lat = request.data.get('latitude')
-    lon = request.data.get('longitude')
-    radius = float(request.data.get('radius', 10))  # default 10km
-    if lat is None or lon is None:
-        return Response({'error': 'latitude and longitude are required.'}, status=400)
-    companies = EmployerRegistration.objects.filter(latitude__isnull=False, longitude__isnull=False)
-    result = []
-    for comp in companies:
-        if comp.latitude is not None and comp.longitude is not None:
-            dist = haversine(lon, lat, comp.longitude, comp.latitude)
-            if dist <= radius:
-                data = EmployerRegistrationSerializer(comp).data
-                data['distance_km'] = dist
-                result.append(data)
-    result.sort(key=lambda x: x['distance_km'])
-    return Response(result)
+    return _nearby_response(request, employer_coordinates, EmployerRegistrationSerializer)
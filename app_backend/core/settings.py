@@ -124,6 +124,46 @@ else:
     }
 
 
+# Django REST framework
+# List endpoints use keyset (cursor) pagination, see apps/pagination.py
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'apps.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
+# Keep returning bare JSON lists to clients that don't request a page. Deprecated: legacy
+# responses carry a Warning header, and the default flips to False in the first backend
+# release after the minimum supported app version sends page_size or cursor on every list call
+API_LEGACY_LIST_RESPONSES = os.environ.get('API_LEGACY_LIST_RESPONSES', 'True').lower() == 'true'
+# Rows a legacy bare-list response is cut off at (X-Result-Truncated: true when it was)
+API_LEGACY_LIST_MAX_ROWS = int(os.environ.get('API_LEGACY_LIST_MAX_ROWS', 500))
+
+
+# Cache
+# Local memory (per process) by default; set REDIS_URL to share the cache between workers
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'jobs-app',
+        }
+    }
+
+# Job post list/detail response cache, see apps/cache.py
+JOB_FEED_CACHE_ALIAS = 'default'
+JOB_FEED_CACHE_TIMEOUT = int(os.environ.get('JOB_FEED_CACHE_TIMEOUT', 60))
+
+# Seconds before the in-memory coordinate snapshots for nearby search are fully reloaded
+DISTANCE_SNAPSHOT_TTL = int(os.environ.get('DISTANCE_SNAPSHOT_TTL', 300))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -188,9 +228,54 @@ AWS_SNS_TOPIC_ARN = os.environ['AWS_SNS_TOPIC_ARN']
 # Add your PlatformApplication ARNs for FCM (Android/iOS) here
 AWS_SNS_PLATFORM_APPLICATION_ARN_EMPLOYEE = os.environ['AWS_SNS_PLATFORM_APPLICATION_ARN_EMPLOYEE']
 AWS_SNS_PLATFORM_APPLICATION_ARN_EMPLOYER = os.environ['AWS_SNS_PLATFORM_APPLICATION_ARN_EMPLOYER']
+# Connections kept open by the shared SNS client, see apps/clients.py; match the push worker's --workers
+AWS_SNS_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_SNS_MAX_POOL_CONNECTIONS', 16))
+
+# Firebase service account used for FCM, loaded on the first push rather than at import
+FIREBASE_CREDENTIALS = os.environ.get(
+    'FIREBASE_CREDENTIALS', BASE_DIR / 'jobs-7809e-firebase-adminsdk-fbsvc-f7d892249c.json'
+)
+
+# 'fake' swaps SNS, Twilio and FCM for the in-memory fakes in apps/clients.py (tests, local runs, load tests)
+EXTERNAL_CLIENTS = os.environ.get('EXTERNAL_CLIENTS', 'live')
+# Seconds each fake call sleeps, to stand in for provider round trips in benchmarks
+FAKE_CLIENT_LATENCY = float(os.environ.get('FAKE_CLIENT_LATENCY', 0))
+
+# Live notification stream over SSE, see apps/streaming.py. PostgresBroker reaches every ASGI
+# worker through LISTEN/NOTIFY; apps.streaming.LocalBroker only wakes streams in the same process,
+# and is the default on SQLite, which has no LISTEN/NOTIFY
+NOTIFICATION_BROKER = os.environ.get(
+    'NOTIFICATION_BROKER',
+    'apps.streaming.LocalBroker' if DATABASES['default']['ENGINE'].endswith('sqlite3') else 'apps.streaming.PostgresBroker',
+)
+SSE_HEARTBEAT_SECONDS = int(os.environ.get('SSE_HEARTBEAT_SECONDS', 20))
+# Reconnect delay suggested to EventSource clients
+SSE_RETRY_MS = int(os.environ.get('SSE_RETRY_MS', 3000))
+# Threads (and so at most this many database connections) per ASGI worker for stream queries
+SSE_DB_THREADS = int(os.environ.get('SSE_DB_THREADS', 8))
+# Read notifications older than this are archived or deleted by the prune_notifications command
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 90))
 
 # Mapbox Settings (ADD THESE)
-MAPBOX_API_KEY = os.environ['MAPBOX_API_KEY']
+MAPBOX_API_KEY = os.environ.get('MAPBOX_API_KEY')
+MAPBOX_GEOCODING_URL = os.environ.get('MAPBOX_GEOCODING_URL', 'https://api.mapbox.com/geocoding/v5/mapbox.places')
+# (connect, read) timeout in seconds for geocoding calls
+MAPBOX_TIMEOUT = (3.05, float(os.environ.get('MAPBOX_READ_TIMEOUT', 10)))
+
+# Geocoder backends tried in order, see apps/geocoding.py. The offline gazetteer answers
+# district/taluk lookups; drop Mapbox to never call out, e.g. GEOCODER_BACKENDS=apps.geocoding.GazetteerGeocoder
+GEOCODER_BACKENDS = os.environ.get(
+    'GEOCODER_BACKENDS', 'apps.geocoding.GazetteerGeocoder,apps.geocoding.MapboxGeocoder'
+).split(',')
+GAZETTEER_PATH = os.environ.get('GAZETTEER_PATH', BASE_DIR / 'apps' / 'data' / 'gazetteer_tamil_nadu.csv')
+# Reverse lookups further than this from every gazetteer centroid fall through to the next backend
+GAZETTEER_MAX_DISTANCE_KM = float(os.environ.get('GAZETTEER_MAX_DISTANCE_KM', 25))
+
+# Geocoding cache, see apps/geocoding.py: in-process LRU in front of the geocode_cache table
+GEOCODE_CACHE_TTL = int(os.environ.get('GEOCODE_CACHE_TTL', 30 * 24 * 60 * 60))
+GEOCODE_CACHE_LRU_SIZE = int(os.environ.get('GEOCODE_CACHE_LRU_SIZE', 2048))
+# Decimal places reverse lookups are rounded to before caching (4 is roughly 11 m)
+GEOCODE_REVERSE_PRECISION = int(os.environ.get('GEOCODE_REVERSE_PRECISION', 4))
 
 # AWS S3 Configuration for Static and Media Files
 AWS_S3_ACCESS_KEY_ID = os.environ.get('AWS_S3_ACCESS_KEY_ID')
@@ -712,20 +712,24 @@ class ApiService {
     );
     if (response.statusCode == 200) {
       final favJobs = json.decode(response.body) as List;
+      final jobIds = favJobs
+          .where((fav) => fav['job'] != null)
+          .map((fav) => fav['job'].toString())
+          .toList();
       List<dynamic> likedJobs = [];
-      for (var fav in favJobs) {
-        if (fav['job'] != null) {
-          final jobId = fav['job'];
-          try {
-            final jobResp = await http.get(
-              Uri.parse('$baseUrl/job-posts/$jobId/'),
-              headers: {'Content-Type': 'application/json'},
-            );
-            if (jobResp.statusCode == 200) {
-              likedJobs.add(json.decode(jobResp.body));
-            }
-          } catch (_) {}
-        }
+      // Batch lookup: the backend resolves up to 200 ids per request, in order
+      for (var start = 0; start < jobIds.length; start += 200) {
+        final chunk = jobIds.sublist(
+            start, start + 200 > jobIds.length ? jobIds.length : start + 200);
+        try {
+          final jobResp = await http.get(
+            Uri.parse('$baseUrl/job-posts/?ids=${chunk.join(',')}'),
+            headers: {'Content-Type': 'application/json'},
+          );
+          if (jobResp.statusCode == 200) {
+            likedJobs.addAll(json.decode(jobResp.body)['results'] as List);
+          }
+        } catch (_) {}
       }
       return likedJobs;
     } else {